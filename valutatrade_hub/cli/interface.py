@@ -1,9 +1,12 @@
 """Команды CLI интерфейса."""
 
 import argparse
+import heapq
 import json
 import sys
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from valutatrade_hub.core.exceptions import (
@@ -11,22 +14,179 @@ from valutatrade_hub.core.exceptions import (
     CurrencyNotFoundError,
     InsufficientFundsError,
 )
-from valutatrade_hub.core.usecases import (
-    buy_currency,
-    get_portfolio_info,
-    get_rate,
-    login_user,
-    logout_user,
-    register_user,
-    sell_currency,
+from valutatrade_hub.core.formatting import CRYPTO_CODES
+from valutatrade_hub.core.formatting import fmt_money as _fmt_money
+
+# Тяжёлые модули (usecases, parser_service, настройки) импортируются
+# лениво внутри cmd_*-функций, чтобы не замедлять старт CLI
+# для простых команд вроде --help.
+
+# Валюты, которые выводятся с повышенной точностью (4 знака вместо 2)
+_HIGH_PRECISION_CCYS: frozenset[str] = CRYPTO_CODES
+
+# Служебные ключи кеша курсов старого формата (не являются парами)
+_META_KEYS: frozenset[str] = frozenset({"source", "last_refresh"})
+
+# Разделитель перед итоговой строкой портфеля
+_SEP = "-" * 40
+
+# Шаблон отчёта о торговой операции: собирается один раз при импорте,
+# весь отчёт пишется в stdout одним вызовом
+_TRADE_TEMPLATE = (
+    "{verb} выполнена: {amount} {currency} "
+    "по курсу {rate} {base}/{currency}\n"
+    "Изменения в портфеле:\n"
+    "  {currency}: было {old} → стало {new}\n"
+    "{label}: {value} {base}\n"
 )
-from valutatrade_hub.infra.settings import SettingsLoader
-from valutatrade_hub.parser_service.api_clients import (
-    CoinGeckoClient,
-    ExchangeRateApiClient,
+
+# Готовые тексты подсказок для групп сообщений об ошибках:
+# строятся один раз при импорте и пишутся в stderr одним вызовом
+_ERR_SUPPORTED_CCYS = (
+    "Проверьте список поддерживаемых валют: USD, EUR, RUB, BTC, ETH\n"
+)
+_ERR_RATE_RETRY = (
+    "Не удалось получить актуальный курс. Повторите попытку позже.\n"
+)
+_ERR_CHECK_BALANCE = (
+    "Проверьте баланс кошелька с помощью команды 'show-portfolio'\n"
+)
+_ERR_GET_RATE_HELP = (
+    "Поддерживаемые валюты: USD, EUR, RUB, BTC, ETH\n"
+    "Используйте 'get-rate --help' для справки по использованию команды\n"
 )
-from valutatrade_hub.parser_service.config import ParserConfig
-from valutatrade_hub.parser_service.updater import RatesUpdater
+_ERR_API_CAUSES = (
+    "Возможные причины:\n"
+    "  - Временная недоступность сервиса получения курсов\n"
+    "  - Проблемы с подключением к сети\n"
+    "Рекомендация: Повторите попытку через несколько секунд\n"
+)
+
+# Связанные форматтеры балансов: спецификация формата разбирается один
+# раз при импорте, а не при каждом вызове f-строки
+_FMT_CRYPTO = "{:.4f}".format
+_FMT_FIAT = "{:.2f}".format
+
+# Выбор форматтера баланса по коду валюты: одна проба словаря вместо
+# проверки принадлежности множеству и ветвления
+_BAL_FMT = dict.fromkeys(_HIGH_PRECISION_CCYS, _FMT_CRYPTO)
+
+
+def _print_trade(info: dict, verb: str, value_key: str, value_label: str) -> None:
+    """
+    Вывести результат торговой операции (общий код buy/sell).
+
+    Args:
+        info: Словарь с информацией об операции (из buy_currency/sell_currency)
+        verb: Название операции ("Покупка" или "Продажа")
+        value_key: Ключ суммы в базовой валюте в info
+        value_label: Подпись для суммы в базовой валюте
+    """
+    currency = info["currency"]
+    amount = info["amount"]
+    old_balance = info["old_balance"]
+    new_balance = info["new_balance"]
+    rate = info["rate"]
+    base_currency = info["base_currency"]
+
+    # Форматируем числа с нужным количеством знаков после запятой
+    fmt = _BAL_FMT.get(currency, _FMT_FIAT)
+    amount_str = fmt(amount)
+    old_balance_str = fmt(old_balance)
+    new_balance_str = fmt(new_balance)
+
+    sys.stdout.write(
+        _TRADE_TEMPLATE.format_map(
+            {
+                "verb": verb,
+                "amount": amount_str,
+                "currency": currency,
+                "rate": _fmt_money(rate),
+                "base": base_currency,
+                "old": old_balance_str,
+                "new": new_balance_str,
+                "label": value_label,
+                "value": _fmt_money(info[value_key]),
+            }
+        )
+    )
+
+
+def _handle_command_error(
+    e: Exception,
+    error_prefix: str,
+    hints: tuple[tuple[type[Exception], str], ...] = (),
+    login_message: str | None = "Ошибка: Сначала выполните login",
+) -> int:
+    """
+    Общий обработчик исключений торговых cmd_*-команд.
+
+    Args:
+        e: Пойманное исключение
+        error_prefix: Префикс сообщения для неожиданных ошибок
+        hints: Пары (класс исключения, текст подсказки) в порядке проверки
+        login_message: Сообщение для RuntimeError (нет активной сессии);
+                       None, если команда не требует логина
+
+    Returns:
+        Код возврата команды (всегда 1)
+    """
+    for exc_type, hint in hints:
+        if isinstance(e, exc_type):
+            sys.stderr.write(f"Ошибка: {e}\n" + hint)
+            return 1
+    if login_message is not None and isinstance(e, RuntimeError):
+        print(login_message, file=sys.stderr)
+        return 1
+    if isinstance(e, ValueError):
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    print(f"{error_prefix}: {e}", file=sys.stderr)
+    return 1
+
+
+def _format_iso_timestamp(value: str, fmt: str) -> str:
+    """
+    Отформатировать ISO-дату, не полагаясь на исключения.
+
+    Дешёвая структурная проверка отсекает заведомо невалидные строки до
+    вызова datetime.fromisoformat, чтобы обычный путь не проходил через
+    механизм исключений.
+
+    Args:
+        value: Строка с датой в формате ISO
+        fmt: Формат для strftime
+
+    Returns:
+        Отформатированная дата или исходная строка, если распарсить не удалось
+    """
+    if (
+        not value
+        or value == "unknown"
+        or len(value) < 10
+        or value[4] != "-"
+        or value[7] != "-"
+    ):
+        return value
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return value
+    return parsed.strftime(fmt)
+
+
+@lru_cache(maxsize=1)
+def _rates_file() -> Path:
+    """
+    Получить путь к файлу кеша курсов (вычисляется один раз).
+
+    Returns:
+        Путь к файлу rates.json
+    """
+    from valutatrade_hub.infra.settings import SettingsLoader
+
+    settings = SettingsLoader()
+    return Path(settings.get("data_dir", "data")) / "rates.json"
 
 
 def cmd_register(args: argparse.Namespace) -> int:
@@ -40,6 +200,8 @@ def cmd_register(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
+        from valutatrade_hub.core.usecases import register_user
+
         user, user_id = register_user(args.username, args.password)
         print(
             f"Пользователь '{user.username}' зарегистрирован (id={user_id}). "
@@ -65,6 +227,8 @@ def cmd_login(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
+        from valutatrade_hub.core.usecases import login_user
+
         user = login_user(args.username, args.password)
         print(f"Вы вошли как '{user.username}'")
         return 0
@@ -87,6 +251,8 @@ def cmd_logout(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
+        from valutatrade_hub.core.usecases import logout_user
+
         logout_user()
         print("Вы вышли из системы")
         return 0
@@ -106,20 +272,25 @@ def cmd_show_portfolio(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
-        base_currency = args.base if hasattr(args, "base") and args.base else "USD"
-        portfolio_info = get_portfolio_info(base_currency)
+        from valutatrade_hub.core.usecases import get_portfolio_info
 
-        user = portfolio_info["user"]
-        base = portfolio_info["base_currency"]
-        wallets_info = portfolio_info["wallets_info"]
-        total_value = portfolio_info["total_value"]
+        # Субпарсер всегда задаёт --base со значением по умолчанию "USD"
+        info = get_portfolio_info(args.base)
 
-        print(f"Портфель пользователя '{user.username}' (база: {base}):")
-
-        if not wallets_info:
-            print("Кошельков нет")
+        # Пустой портфель обрабатываем до любой работы с форматированием
+        if not info.wallets_info:
+            sys.stdout.write(
+                f"Портфель пользователя '{info.user.username}' "
+                f"(база: {info.base_currency}):\nКошельков нет\n"
+            )
             return 0
 
+        # PortfolioInfo — NamedTuple, распаковывается одной операцией
+        user, _, base, wallets_info, total_value = info
+
+        # Накапливаем строки и пишем одним вызовом вместо print на строку
+        lines = [f"Портфель пользователя '{user.username}' (база: {base}):"]
+
         # Форматируем вывод для каждого кошелька
         for wallet_info in wallets_info:
             currency_code = wallet_info["currency_code"]
@@ -127,19 +298,22 @@ def cmd_show_portfolio(args: argparse.Namespace) -> int:
             value_in_base = wallet_info["value_in_base"]
 
             # Форматируем числа с нужным количеством знаков после запятой
-            if currency_code in ("BTC", "ETH"):
-                balance_str = f"{balance:.4f}"
-            else:
-                balance_str = f"{balance:.2f}"
+            balance_str = _BAL_FMT.get(currency_code, _FMT_FIAT)(balance)
 
-            value_str = f"{value_in_base:,.2f}".replace(",", " ")
+            value_str = _fmt_money(value_in_base)
 
-            print(f"- {currency_code}: {balance_str:>10}  → {value_str:>12} {base}")
+            # rjust вместо f-строки: без разбора спецификации выравнивания
+            lines.append(
+                "- " + currency_code + ": " + balance_str.rjust(10)
+                + "  → " + value_str.rjust(12) + " " + base
+            )
 
         # Итоговая сумма
-        total_str = f"{total_value:,.2f}".replace(",", " ")
-        print("-" * 40)
-        print(f"ИТОГО: {total_str} {base}")
+        total_str = _fmt_money(total_value)
+        lines.append(_SEP)
+        lines.append(f"ИТОГО: {total_str} {base}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return 0
     except RuntimeError:
@@ -164,61 +338,27 @@ def cmd_buy(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
-        purchase_info = buy_currency(args.currency, args.amount)
+        from valutatrade_hub.core.usecases import buy_currency
 
-        currency = purchase_info["currency"]
-        amount = purchase_info["amount"]
-        old_balance = purchase_info["old_balance"]
-        new_balance = purchase_info["new_balance"]
-        rate = purchase_info["rate"]
-        cost_in_base = purchase_info["cost_in_base"]
-        base_currency = purchase_info["base_currency"]
-
-        # Форматируем вывод
-        if currency in ("BTC", "ETH"):
-            amount_str = f"{amount:.4f}"
-            old_balance_str = f"{old_balance:.4f}"
-            new_balance_str = f"{new_balance:.4f}"
-        else:
-            amount_str = f"{amount:.2f}"
-            old_balance_str = f"{old_balance:.2f}"
-            new_balance_str = f"{new_balance:.2f}"
-
-        rate_str = f"{rate:,.2f}".replace(",", " ")
-        cost_str = f"{cost_in_base:,.2f}".replace(",", " ")
+        purchase_info = buy_currency(args.currency, args.amount)
 
-        print(
-            f"Покупка выполнена: {amount_str} {currency} "
-            f"по курсу {rate_str} {base_currency}/{currency}"
+        _print_trade(
+            purchase_info,
+            "Покупка",
+            "cost_in_base",
+            "Оценочная стоимость покупки",
         )
-        print("Изменения в портфеле:")
-        print(f"  {currency}: было {old_balance_str} → стало {new_balance_str}")
-        print(f"Оценочная стоимость покупки: {cost_str} {base_currency}")
 
         return 0
-    except RuntimeError:
-        print("Ошибка: Сначала выполните login", file=sys.stderr)
-        return 1
-    except CurrencyNotFoundError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Проверьте список поддерживаемых валют: USD, EUR, RUB, BTC, ETH",
-            file=sys.stderr,
-        )
-        return 1
-    except ApiRequestError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Не удалось получить актуальный курс. Повторите попытку позже.",
-            file=sys.stderr,
-        )
-        return 1
-    except ValueError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        return 1
     except Exception as e:
-        print(f"Ошибка покупки: {e}", file=sys.stderr)
-        return 1
+        return _handle_command_error(
+            e,
+            "Ошибка покупки",
+            hints=(
+                (CurrencyNotFoundError, _ERR_SUPPORTED_CCYS),
+                (ApiRequestError, _ERR_RATE_RETRY),
+            ),
+        )
 
 
 def cmd_sell(args: argparse.Namespace) -> int:
@@ -232,68 +372,23 @@ def cmd_sell(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
-        sale_info = sell_currency(args.currency, args.amount)
-
-        currency = sale_info["currency"]
-        amount = sale_info["amount"]
-        old_balance = sale_info["old_balance"]
-        new_balance = sale_info["new_balance"]
-        rate = sale_info["rate"]
-        revenue_in_base = sale_info["revenue_in_base"]
-        base_currency = sale_info["base_currency"]
-
-        # Форматируем вывод
-        if currency in ("BTC", "ETH"):
-            amount_str = f"{amount:.4f}"
-            old_balance_str = f"{old_balance:.4f}"
-            new_balance_str = f"{new_balance:.4f}"
-        else:
-            amount_str = f"{amount:.2f}"
-            old_balance_str = f"{old_balance:.2f}"
-            new_balance_str = f"{new_balance:.2f}"
+        from valutatrade_hub.core.usecases import sell_currency
 
-        rate_str = f"{rate:,.2f}".replace(",", " ")
-        revenue_str = f"{revenue_in_base:,.2f}".replace(",", " ")
+        sale_info = sell_currency(args.currency, args.amount)
 
-        print(
-            f"Продажа выполнена: {amount_str} {currency} "
-            f"по курсу {rate_str} {base_currency}/{currency}"
-        )
-        print("Изменения в портфеле:")
-        print(f"  {currency}: было {old_balance_str} → стало {new_balance_str}")
-        print(f"Оценочная выручка: {revenue_str} {base_currency}")
+        _print_trade(sale_info, "Продажа", "revenue_in_base", "Оценочная выручка")
 
         return 0
-    except RuntimeError:
-        print("Ошибка: Сначала выполните login", file=sys.stderr)
-        return 1
-    except InsufficientFundsError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Проверьте баланс кошелька с помощью команды 'show-portfolio'",
-            file=sys.stderr,
-        )
-        return 1
-    except CurrencyNotFoundError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Проверьте список поддерживаемых валют: USD, EUR, RUB, BTC, ETH",
-            file=sys.stderr,
-        )
-        return 1
-    except ApiRequestError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Не удалось получить актуальный курс. Повторите попытку позже.",
-            file=sys.stderr,
-        )
-        return 1
-    except ValueError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        return 1
     except Exception as e:
-        print(f"Ошибка продажи: {e}", file=sys.stderr)
-        return 1
+        return _handle_command_error(
+            e,
+            "Ошибка продажи",
+            hints=(
+                (InsufficientFundsError, _ERR_CHECK_BALANCE),
+                (CurrencyNotFoundError, _ERR_SUPPORTED_CCYS),
+                (ApiRequestError, _ERR_RATE_RETRY),
+            ),
+        )
 
 
 def cmd_update_rates(args: argparse.Namespace) -> int:
@@ -309,6 +404,13 @@ def cmd_update_rates(args: argparse.Namespace) -> int:
     print("INFO: Starting rates update...")
 
     try:
+        from valutatrade_hub.parser_service.api_clients import (
+            CoinGeckoClient,
+            ExchangeRateApiClient,
+        )
+        from valutatrade_hub.parser_service.config import ParserConfig
+        from valutatrade_hub.parser_service.updater import RatesUpdater
+
         config = ParserConfig()
         clients = []
 
@@ -339,14 +441,11 @@ def cmd_update_rates(args: argparse.Namespace) -> int:
         last_refresh = result.get("timestamp", "")
         sources = result.get("sources", {})
 
-        # Подсчитываем курсы по источникам для вывода
+        # Подсчитываем курсы по источникам за один проход
         if not hasattr(args, "source") or not args.source:
-            coingecko_count = sum(
-                1 for s in sources.values() if s == "CoinGecko"
-            )
-            exchangerate_count = sum(
-                1 for s in sources.values() if s == "ExchangeRate-API"
-            )
+            counts = Counter(sources.values())
+            coingecko_count = counts.get("CoinGecko", 0)
+            exchangerate_count = counts.get("ExchangeRate-API", 0)
             if coingecko_count > 0:
                 print(f"INFO: Fetching from CoinGecko... OK ({coingecko_count} rates)")
             if exchangerate_count > 0:
@@ -356,9 +455,7 @@ def cmd_update_rates(args: argparse.Namespace) -> int:
                 )
 
         # Выводим информацию о записи
-        settings = SettingsLoader()
-        data_dir = Path(settings.get("data_dir", "data"))
-        rates_file = data_dir / "rates.json"
+        rates_file = _rates_file()
         print(f"INFO: Writing {total_pairs} rates to {rates_file}...")
 
         if errors:
@@ -385,6 +482,46 @@ def cmd_update_rates(args: argparse.Namespace) -> int:
         return 1
 
 
+def _select_pairs(
+    pairs: dict[str, dict],
+    cur_filter: str | None,
+    base_filter: str | None,
+    top_n: int | None,
+) -> list[tuple[str, str, dict]]:
+    """
+    Отфильтровать пары курсов и выбрать записи для вывода за один проход.
+
+    Args:
+        pairs: Словарь пар курсов из кеша
+        cur_filter: Код исходной валюты для фильтра (в верхнем регистре)
+        base_filter: Код базовой валюты для фильтра (в верхнем регистре)
+        top_n: Если задано, вернуть N пар с наибольшим курсом
+
+    Returns:
+        Список кортежей (ключ пары, исходная валюта, данные пары)
+    """
+
+    def _candidates():
+        for pair_key, pair_data in pairs.items():
+            from_currency, to_currency = pair_key.split("_", 1)
+            # Коды в кеше уже в верхнем регистре, поэтому сначала прямое
+            # сравнение, и только при несовпадении - .upper() с аллокацией
+            if cur_filter and from_currency != cur_filter:
+                if from_currency.upper() != cur_filter:
+                    continue
+            if base_filter and to_currency != base_filter:
+                if to_currency.upper() != base_filter:
+                    continue
+            yield pair_key, from_currency, pair_data
+
+    if top_n:
+        # Куча размера N вместо полной сортировки: O(N log top_n)
+        return heapq.nlargest(
+            top_n, _candidates(), key=lambda x: x[2].get("rate", 0)
+        )
+    return sorted(_candidates(), key=lambda x: x[0])
+
+
 def cmd_show_rates(args: argparse.Namespace) -> int:
     """
     Обработка команды show-rates.
@@ -397,9 +534,7 @@ def cmd_show_rates(args: argparse.Namespace) -> int:
     """
     try:
         # Загружаем данные из кэша
-        settings = SettingsLoader()
-        data_dir = Path(settings.get("data_dir", "data"))
-        rates_file = data_dir / "rates.json"
+        rates_file = _rates_file()
 
         if not rates_file.exists():
             print(
@@ -409,21 +544,22 @@ def cmd_show_rates(args: argparse.Namespace) -> int:
             )
             return 1
 
-        with open(rates_file, encoding="utf-8") as f:
-            cache_data = json.load(f)
+        # Читаем файл целиком и парсим одним вызовом C-сканера json:
+        # без построчного чтения через текстовую обёртку
+        cache_data = json.loads(rates_file.read_bytes())
 
-        # Поддерживаем оба формата: новый (через "pairs") и старый (прямые пары)
-        if "pairs" in cache_data:
-            # Новый формат
-            pairs = cache_data["pairs"]
-            last_refresh = cache_data.get("last_refresh", "unknown")
-        else:
+        # Поддерживаем оба формата: новый (через "pairs") и старый (прямые пары).
+        # Новый формат - норма после update-rates, поэтому он идёт первым
+        # и обходится одной пробой словаря
+        pairs = cache_data.get("pairs")
+        if pairs is None:
             # Старый формат - преобразуем в новый
-            pairs = {}
-            for key, value in cache_data.items():
-                if key not in ("source", "last_refresh") and isinstance(value, dict):
-                    pairs[key] = value
-            last_refresh = cache_data.get("last_refresh", "unknown")
+            pairs = {
+                key: value
+                for key, value in cache_data.items()
+                if key not in _META_KEYS and isinstance(value, dict)
+            }
+        last_refresh = cache_data.get("last_refresh", "unknown")
 
         # Проверяем, есть ли данные
         if not pairs:
@@ -435,73 +571,47 @@ def cmd_show_rates(args: argparse.Namespace) -> int:
             return 1
 
         # Форматируем дату обновления
-        try:
-            if last_refresh and last_refresh != "unknown":
-                updated_at = datetime.fromisoformat(
-                    last_refresh.replace("Z", "+00:00")
-                )
-                updated_at_str = updated_at.strftime("%Y-%m-%dT%H:%M:%S")
-            else:
-                updated_at_str = "unknown"
-        except (ValueError, TypeError):
-            updated_at_str = last_refresh
-
-        # Применяем фильтры
-        filtered_pairs: list[tuple[str, dict]] = []
-
-        for pair_key, pair_data in pairs.items():
-            from_currency, to_currency = pair_key.split("_", 1)
-
-            # Фильтр по валюте
-            if hasattr(args, "currency") and args.currency:
-                if from_currency.upper() != args.currency.upper():
-                    continue
+        updated_at_str = _format_iso_timestamp(
+            last_refresh or "unknown", "%Y-%m-%dT%H:%M:%S"
+        )
 
-            # Фильтр по базе
-            if hasattr(args, "base") and args.base:
-                if to_currency.upper() != args.base.upper():
-                    continue
+        # Применяем фильтры и отбираем пары за один проход
+        cur_filter = (
+            args.currency.upper() if getattr(args, "currency", None) else None
+        )
+        base_filter = args.base.upper() if getattr(args, "base", None) else None
+        top_n = getattr(args, "top", None)
 
-            filtered_pairs.append((pair_key, pair_data))
+        filtered_pairs = _select_pairs(pairs, cur_filter, base_filter, top_n)
 
         # Если фильтр по валюте не дал результатов
-        if hasattr(args, "currency") and args.currency and not filtered_pairs:
+        if cur_filter and not filtered_pairs:
             print(
                 f"Курс для '{args.currency}' не найден в кеше.",
                 file=sys.stderr,
             )
             return 1
 
-        # Сортировка для --top
-        if hasattr(args, "top") and args.top:
-            # Сортируем по курсу (по убыванию)
-            filtered_pairs.sort(
-                key=lambda x: x[1].get("rate", 0), reverse=True
-            )
-            # Берем только топ N
-            filtered_pairs = filtered_pairs[: args.top]
-        else:
-            # Сортируем по алфавиту
-            filtered_pairs.sort(key=lambda x: x[0])
-
-        # Выводим результаты
-        print(f"Rates from cache (updated at {updated_at_str}):")
+        # Накапливаем строки и пишем одним вызовом вместо print на строку
+        lines = [f"Rates from cache (updated at {updated_at_str}):"]
 
         if not filtered_pairs:
-            print("Нет курсов, соответствующих заданным фильтрам.")
+            lines.append("Нет курсов, соответствующих заданным фильтрам.")
+            sys.stdout.write("\n".join(lines) + "\n")
             return 0
 
-        for pair_key, pair_data in filtered_pairs:
+        for pair_key, from_currency, pair_data in filtered_pairs:
             rate = pair_data.get("rate", 0)
 
             # Форматируем курс в зависимости от валюты
-            from_currency = pair_key.split("_", 1)[0]
-            if from_currency in ("BTC", "ETH"):
+            if from_currency in _HIGH_PRECISION_CCYS:
                 rate_str = f"{rate:.2f}"
             else:
                 rate_str = f"{rate:.5f}"
 
-            print(f"- {pair_key}: {rate_str}")
+            lines.append(f"- {pair_key}: {rate_str}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return 0
 
@@ -521,6 +631,8 @@ def cmd_get_rate(args: argparse.Namespace) -> int:
         Код возврата (0 - успех, 1 - ошибка)
     """
     try:
+        from valutatrade_hub.core.usecases import get_rate
+
         rate_info = get_rate(args.from_currency, args.to_currency)
 
         from_currency = rate_info["from_currency"]
@@ -530,14 +642,12 @@ def cmd_get_rate(args: argparse.Namespace) -> int:
         reverse_rate = rate_info["reverse_rate"]
 
         # Форматируем дату обновления
-        try:
-            updated_at = datetime.fromisoformat(updated_at_str)
-            updated_at_formatted = updated_at.strftime("%Y-%m-%d %H:%M:%S")
-        except (ValueError, TypeError):
-            updated_at_formatted = updated_at_str
+        updated_at_formatted = _format_iso_timestamp(
+            updated_at_str, "%Y-%m-%d %H:%M:%S"
+        )
 
         # Форматируем курс в зависимости от валют
-        if to_currency in ("BTC", "ETH"):
+        if to_currency in _HIGH_PRECISION_CCYS:
             rate_str = f"{rate:.8f}"
         else:
             rate_str = f"{rate:.5f}"
@@ -547,7 +657,7 @@ def cmd_get_rate(args: argparse.Namespace) -> int:
         if reverse_rate < 0.01:
             reverse_rate_str = f"{reverse_rate:.8f}"
         else:
-            reverse_rate_str = f"{reverse_rate:,.2f}".replace(",", " ")
+            reverse_rate_str = _fmt_money(reverse_rate)
 
         print(
             f"Курс {from_currency}→{to_currency}: {rate_str} "
@@ -556,61 +666,20 @@ def cmd_get_rate(args: argparse.Namespace) -> int:
         print(f"  Обратный курс {to_currency}→{from_currency}: {reverse_rate_str}")
 
         return 0
-    except CurrencyNotFoundError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Поддерживаемые валюты: USD, EUR, RUB, BTC, ETH",
-            file=sys.stderr,
-        )
-        print(
-            "Используйте 'get-rate --help' для справки по использованию команды",
-            file=sys.stderr,
-        )
-        return 1
-    except ApiRequestError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        print(
-            "Возможные причины:",
-            file=sys.stderr,
-        )
-        print(
-            "  - Временная недоступность сервиса получения курсов",
-            file=sys.stderr,
-        )
-        print(
-            "  - Проблемы с подключением к сети",
-            file=sys.stderr,
-        )
-        print(
-            "Рекомендация: Повторите попытку через несколько секунд",
-            file=sys.stderr,
-        )
-        return 1
-    except ValueError as e:
-        print(f"Ошибка: {e}", file=sys.stderr)
-        return 1
     except Exception as e:
-        print(f"Ошибка получения курса: {e}", file=sys.stderr)
-        return 1
-
-
-def create_parser() -> argparse.ArgumentParser:
-    """
-    Создать парсер аргументов командной строки.
+        return _handle_command_error(
+            e,
+            "Ошибка получения курса",
+            hints=(
+                (CurrencyNotFoundError, _ERR_GET_RATE_HELP),
+                (ApiRequestError, _ERR_API_CAUSES),
+            ),
+            login_message=None,
+        )
 
-    Returns:
-        Настроенный ArgumentParser
-    """
-    parser = argparse.ArgumentParser(
-        description="Валютный кошелек - консольное приложение"
-    )
-    subparsers = parser.add_subparsers(
-        dest="command",
-        help="Доступные команды",
-        metavar="COMMAND",
-    )
 
-    # Команда register
+def _build_register_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды register."""
     register_parser = subparsers.add_parser(
         "register", help="Зарегистрировать нового пользователя"
     )
@@ -626,8 +695,11 @@ def create_parser() -> argparse.ArgumentParser:
         required=True,
         help="Пароль (обязательно, минимум 4 символа)",
     )
+    register_parser.set_defaults(func=cmd_register)
+
 
-    # Команда login
+def _build_login_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды login."""
     login_parser = subparsers.add_parser(
         "login", help="Войти в систему"
     )
@@ -643,11 +715,17 @@ def create_parser() -> argparse.ArgumentParser:
         required=True,
         help="Пароль (обязательно)",
     )
+    login_parser.set_defaults(func=cmd_login)
 
-    # Команда logout
-    subparsers.add_parser("logout", help="Выйти из системы")
 
-    # Команда show-portfolio
+def _build_logout_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды logout."""
+    logout_parser = subparsers.add_parser("logout", help="Выйти из системы")
+    logout_parser.set_defaults(func=cmd_logout)
+
+
+def _build_show_portfolio_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды show-portfolio."""
     show_portfolio_parser = subparsers.add_parser(
         "show-portfolio", help="Показать портфель пользователя"
     )
@@ -657,8 +735,11 @@ def create_parser() -> argparse.ArgumentParser:
         default="USD",
         help="Базовая валюта конвертации (по умолчанию USD)",
     )
+    show_portfolio_parser.set_defaults(func=cmd_show_portfolio)
 
-    # Команда buy
+
+def _build_buy_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды buy."""
     buy_parser = subparsers.add_parser(
         "buy", help="Купить валюту"
     )
@@ -674,8 +755,11 @@ def create_parser() -> argparse.ArgumentParser:
         required=True,
         help="Количество покупаемой валюты (в штуках)",
     )
+    buy_parser.set_defaults(func=cmd_buy)
+
 
-    # Команда sell
+def _build_sell_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды sell."""
     sell_parser = subparsers.add_parser(
         "sell", help="Продать валюту"
     )
@@ -691,8 +775,11 @@ def create_parser() -> argparse.ArgumentParser:
         required=True,
         help="Количество продаваемой валюты",
     )
+    sell_parser.set_defaults(func=cmd_sell)
 
-    # Команда get-rate
+
+def _build_get_rate_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды get-rate."""
     get_rate_parser = subparsers.add_parser(
         "get-rate", help="Получить курс обмена валют"
     )
@@ -710,8 +797,11 @@ def create_parser() -> argparse.ArgumentParser:
         required=True,
         help="Целевая валюта (например, BTC)",
     )
+    get_rate_parser.set_defaults(func=cmd_get_rate)
+
 
-    # Команда update-rates
+def _build_update_rates_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды update-rates."""
     update_rates_parser = subparsers.add_parser(
         "update-rates", help="Обновить курсы валют из внешних источников"
     )
@@ -722,8 +812,11 @@ def create_parser() -> argparse.ArgumentParser:
         help="Обновить данные только из указанного источника "
         "(по умолчанию - все)",
     )
+    update_rates_parser.set_defaults(func=cmd_update_rates)
 
-    # Команда show-rates
+
+def _build_show_rates_parser(subparsers) -> None:
+    """Зарегистрировать субпарсер команды show-rates."""
     show_rates_parser = subparsers.add_parser(
         "show-rates", help="Показать курсы валют из локального кеша"
     )
@@ -742,6 +835,154 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Показать все курсы относительно указанной базы (например, EUR)",
     )
+    show_rates_parser.set_defaults(func=cmd_show_rates)
+
+
+# Реестр построителей субпарсеров по имени команды
+_PARSER_BUILDERS: dict = {
+    "register": _build_register_parser,
+    "login": _build_login_parser,
+    "logout": _build_logout_parser,
+    "show-portfolio": _build_show_portfolio_parser,
+    "buy": _build_buy_parser,
+    "sell": _build_sell_parser,
+    "get-rate": _build_get_rate_parser,
+    "update-rates": _build_update_rates_parser,
+    "show-rates": _build_show_rates_parser,
+}
+
+
+# Спецификации быстрого разбора: команда -> (обработчик,
+# {флаг: (имя атрибута, конвертер)}, обязательные атрибуты, значения
+# по умолчанию). update-rates намеренно отсутствует: валидацию choices
+# для --source оставляем argparse ради корректного сообщения об ошибке.
+_FAST_SPECS: dict[str, tuple] = {
+    "register": (
+        cmd_register,
+        {"--username": ("username", str), "--password": ("password", str)},
+        ("username", "password"),
+        {},
+    ),
+    "login": (
+        cmd_login,
+        {"--username": ("username", str), "--password": ("password", str)},
+        ("username", "password"),
+        {},
+    ),
+    "logout": (cmd_logout, {}, (), {}),
+    "show-portfolio": (
+        cmd_show_portfolio,
+        {"--base": ("base", str)},
+        (),
+        {"base": "USD"},
+    ),
+    "buy": (
+        cmd_buy,
+        {"--currency": ("currency", str), "--amount": ("amount", float)},
+        ("currency", "amount"),
+        {},
+    ),
+    "sell": (
+        cmd_sell,
+        {"--currency": ("currency", str), "--amount": ("amount", float)},
+        ("currency", "amount"),
+        {},
+    ),
+    "get-rate": (
+        cmd_get_rate,
+        {"--from": ("from_currency", str), "--to": ("to_currency", str)},
+        ("from_currency", "to_currency"),
+        {},
+    ),
+    "show-rates": (
+        cmd_show_rates,
+        {
+            "--currency": ("currency", str),
+            "--top": ("top", int),
+            "--base": ("base", str),
+        },
+        (),
+        {"currency": None, "top": None, "base": None},
+    ),
+}
+
+
+def _fast_parse(tokens: list[str]) -> argparse.Namespace | None:
+    """
+    Быстрый разбор команды без argparse для известной грамматики.
+
+    Грамматика команд фиксированная (команда + пары --флаг значение),
+    поэтому типичный вызов разбирается прямым проходом по токенам.
+    Любое отклонение (неизвестная команда или флаг, --help, нехватка
+    значения, ошибка конвертации, пропущенный обязательный флаг)
+    возвращает None — вызывающий код откатывается на argparse.
+
+    Args:
+        tokens: Токены командной строки (первый — имя команды)
+
+    Returns:
+        Namespace с аргументами или None, если нужен полный парсер
+    """
+    spec = _FAST_SPECS.get(tokens[0])
+    if spec is None:
+        return None
+
+    func, flags, required, defaults = spec
+    values = dict(defaults)
+
+    i = 1
+    n = len(tokens)
+    while i < n:
+        entry = flags.get(tokens[i])
+        if entry is None or i + 1 >= n:
+            return None
+        dest, convert = entry
+        try:
+            values[dest] = convert(tokens[i + 1])
+        except ValueError:
+            return None
+        i += 2
+
+    for dest in required:
+        if dest not in values:
+            return None
+
+    return argparse.Namespace(command=tokens[0], func=func, **values)
+
+
+@lru_cache(maxsize=16)
+def create_parser(only: str | None = None) -> argparse.ArgumentParser:
+    """
+    Создать парсер аргументов командной строки.
+
+    Парсеры кешируются по `only`: в интерактивном режиме повторные
+    команды переиспользуют уже построенный парсер вместо повторной
+    регистрации аргументов (parse_args не мутирует парсер).
+
+    Args:
+        only: Имя известной команды, если нужно построить только её
+              субпарсер (ускоряет разбор: аргументы остальных команд
+              не регистрируются). Для None или неизвестного имени
+              строится полный парсер.
+
+    Returns:
+        Настроенный ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        description="Валютный кошелек - консольное приложение"
+    )
+    subparsers = parser.add_subparsers(
+        dest="command",
+        help="Доступные команды",
+        metavar="COMMAND",
+    )
+
+    builder = _PARSER_BUILDERS.get(only) if only is not None else None
+    if builder is not None:
+        builder(subparsers)
+    else:
+        for build in _PARSER_BUILDERS.values():
+            build(subparsers)
 
     return parser
 
@@ -756,10 +997,19 @@ def _parse_command_line(command_line: str) -> argparse.Namespace | None:
     Returns:
         Namespace с аргументами или None, если команда пустая или невалидная
     """
-    if not command_line.strip():
+    tokens = command_line.split()
+    if not tokens:
         return None
 
-    parser = create_parser()
+    # Типичные команды разбираются без argparse
+    args = _fast_parse(tokens)
+    if args is not None:
+        return args
+
+    # Строим только субпарсер запрошенной команды (неизвестные имена
+    # нормализуем в None, чтобы не раздувать кеш парсеров)
+    only = tokens[0] if tokens[0] in _PARSER_BUILDERS else None
+    parser = create_parser(only=only)
     original_exit = parser.exit
     original_error = parser.error
     original_print_help = parser.print_help
@@ -786,8 +1036,7 @@ def _parse_command_line(command_line: str) -> argparse.Namespace | None:
     parser.print_help = fake_print_help
 
     try:
-        # Разбиваем строку на аргументы
-        args = parser.parse_args(command_line.split())
+        args = parser.parse_args(tokens)
         return args
     except SystemExit:
         # Если была ошибка парсинга, возвращаем специальный объект с сообщением
@@ -810,20 +1059,26 @@ def _parse_command_line(command_line: str) -> argparse.Namespace | None:
         parser.print_help = original_print_help
 
 
+# Готовая справка: выводится одной записью без построения argparse
+_COMMANDS_HELP = (
+    "Доступные команды:\n"
+    "  register --username USERNAME --password PASSWORD\n"
+    "  login --username USERNAME --password PASSWORD\n"
+    "  logout\n"
+    "  show-portfolio [--base CURRENCY]\n"
+    "  buy --currency CURRENCY --amount AMOUNT\n"
+    "  sell --currency CURRENCY --amount AMOUNT\n"
+    "  get-rate --from CURRENCY --to CURRENCY\n"
+    "  update-rates [--source coingecko|exchangerate]\n"
+    "  show-rates [--currency CURRENCY] [--top N] [--base CURRENCY]\n"
+    "  exit\n"
+    "\n"
+)
+
+
 def _print_commands_help() -> None:
     """Вывести список доступных команд."""
-    print("Доступные команды:")
-    print("  register --username USERNAME --password PASSWORD")
-    print("  login --username USERNAME --password PASSWORD")
-    print("  logout")
-    print("  show-portfolio [--base CURRENCY]")
-    print("  buy --currency CURRENCY --amount AMOUNT")
-    print("  sell --currency CURRENCY --amount AMOUNT")
-    print("  get-rate --from CURRENCY --to CURRENCY")
-    print("  update-rates [--source coingecko|exchangerate]")
-    print("  show-rates [--currency CURRENCY] [--top N] [--base CURRENCY]")
-    print("  exit")
-    print()
+    sys.stdout.write(_COMMANDS_HELP)
 
 
 def main() -> int:
@@ -835,36 +1090,22 @@ def main() -> int:
     """
     # Проверяем, есть ли аргументы командной строки (кроме help)
     if len(sys.argv) > 1 and sys.argv[1] not in ("-h", "--help"):
-        # Режим одной команды (старое поведение)
-        parser = create_parser()
-        args = parser.parse_args()
-
-        if not args.command:
-            parser.print_help()
-            return 1
+        # Режим одной команды (старое поведение).
+        # Сначала пробуем быстрый разбор без argparse
+        args = _fast_parse(sys.argv[1:])
+
+        if args is None:
+            # Строим только субпарсер запрошенной команды
+            only = sys.argv[1] if sys.argv[1] in _PARSER_BUILDERS else None
+            parser = create_parser(only=only)
+            args = parser.parse_args()
+
+            if not args.command:
+                parser.print_help()
+                return 1
 
-        # Маршрутизация команд
-        if args.command == "register":
-            return cmd_register(args)
-        if args.command == "login":
-            return cmd_login(args)
-        if args.command == "logout":
-            return cmd_logout(args)
-        if args.command == "show-portfolio":
-            return cmd_show_portfolio(args)
-        if args.command == "buy":
-            return cmd_buy(args)
-        if args.command == "sell":
-            return cmd_sell(args)
-        if args.command == "get-rate":
-            return cmd_get_rate(args)
-        if args.command == "update-rates":
-            return cmd_update_rates(args)
-        if args.command == "show-rates":
-            return cmd_show_rates(args)
-
-        print(f"Неизвестная команда: {args.command}", file=sys.stderr)
-        return 1
+        # Маршрутизация через func, назначенный в set_defaults()
+        return args.func(args)
 
     # Интерактивный режим
     print("Валютный кошелек - консольное приложение")
@@ -880,6 +1121,8 @@ def main() -> int:
 
             if command_line.lower() == "exit":
                 # Автоматический logout при выходе
+                from valutatrade_hub.core.usecases import logout_user
+
                 logout_user()
                 print("До свидания!")
                 return 0
@@ -912,38 +1155,23 @@ def main() -> int:
                 print()
                 continue
 
-            # Маршрутизация команд
-            if args.command == "register":
-                cmd_register(args)
-            elif args.command == "login":
-                cmd_login(args)
-            elif args.command == "logout":
-                cmd_logout(args)
-            elif args.command == "show-portfolio":
-                cmd_show_portfolio(args)
-            elif args.command == "buy":
-                cmd_buy(args)
-            elif args.command == "sell":
-                cmd_sell(args)
-            elif args.command == "get-rate":
-                cmd_get_rate(args)
-            elif args.command == "update-rates":
-                cmd_update_rates(args)
-            elif args.command == "show-rates":
-                cmd_show_rates(args)
-            else:
-                print(f"Неизвестная команда: {args.command}", file=sys.stderr)
+            # Маршрутизация через func, назначенный в set_defaults()
+            args.func(args)
 
             print()  # Пустая строка для читаемости
 
         except KeyboardInterrupt:
             # Ctrl+C - выход с автоматическим logout
             print("\nВыход...")
+            from valutatrade_hub.core.usecases import logout_user
+
             logout_user()
             return 0
         except EOFError:
             # Ctrl+D - выход с автоматическим logout
             print("\nВыход...")
+            from valutatrade_hub.core.usecases import logout_user
+
             logout_user()
             return 0
         except Exception as e:
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sys
+from functools import lru_cache
+
 from valutatrade_hub.core.exceptions import CurrencyNotFoundError
 from valutatrade_hub.core.models import (
     CryptoCurrency,
@@ -9,47 +12,69 @@ from valutatrade_hub.core.models import (
     FiatCurrency,
 )
 
-# Регистр валют
-_CURRENCIES: dict[str, Currency] = {}
-
-
-def _initialize_currencies() -> None:
-    """Инициализировать регистр валют."""
-    global _CURRENCIES
-
-    if _CURRENCIES:
-        return  # Уже инициализирован
-
+# Регистр валют: данные статичны, поэтому заполняется один раз
+# при импорте модуля без ленивой инициализации
+_CURRENCIES: dict[str, Currency] = {
     # Фиатные валюты
-    _CURRENCIES["USD"] = FiatCurrency(
+    "USD": FiatCurrency(
         name="US Dollar",
         code="USD",
         issuing_country="United States",
-    )
-    _CURRENCIES["EUR"] = FiatCurrency(
+    ),
+    "EUR": FiatCurrency(
         name="Euro",
         code="EUR",
         issuing_country="Eurozone",
-    )
-    _CURRENCIES["RUB"] = FiatCurrency(
+    ),
+    "RUB": FiatCurrency(
         name="Russian Ruble",
         code="RUB",
         issuing_country="Russia",
-    )
-
+    ),
     # Криптовалюты
-    _CURRENCIES["BTC"] = CryptoCurrency(
+    "BTC": CryptoCurrency(
         name="Bitcoin",
         code="BTC",
         algorithm="SHA-256",
         market_cap=1.12e12,  # Примерная капитализация
-    )
-    _CURRENCIES["ETH"] = CryptoCurrency(
+    ),
+    "ETH": CryptoCurrency(
         name="Ethereum",
         code="ETH",
         algorithm="Ethash",
         market_cap=4.5e11,  # Примерная капитализация
-    )
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _resolve(code: str) -> Currency:
+    """
+    Нормализовать код и найти валюту в регистре.
+
+    Кеширует результат по исходной строке: повторные запросы одних и
+    тех же кодов (циклы по кошелькам, логирование) не выполняют
+    strip/upper заново.
+
+    Args:
+        code: Код валюты в произвольном регистре
+
+    Returns:
+        Объект Currency (FiatCurrency или CryptoCurrency)
+
+    Raises:
+        CurrencyNotFoundError: Если валюта с таким кодом не найдена
+    """
+    # Интернируем нормализованный код: ключи-литералы регистра уже
+    # интернированы компилятором, поэтому успешный поиск сравнивает
+    # строки по идентичности, минуя побайтовое сравнение
+    normalized = sys.intern(code.strip().upper())
+    # Один поиск по словарю вместо пары "in" + "[]"
+    currency = _CURRENCIES.get(normalized)
+    if currency is None:
+        raise CurrencyNotFoundError(f"Валюта с кодом '{normalized}' не найдена")
+
+    return currency
 
 
 def get_currency(code: str) -> Currency:
@@ -65,11 +90,5 @@ def get_currency(code: str) -> Currency:
     Raises:
         CurrencyNotFoundError: Если валюта с таким кодом не найдена
     """
-    _initialize_currencies()
-
-    code = code.strip().upper()
-    if code not in _CURRENCIES:
-        raise CurrencyNotFoundError(f"Валюта с кодом '{code}' не найдена")
-
-    return _CURRENCIES[code]
+    return _resolve(code)
 
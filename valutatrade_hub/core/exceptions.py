@@ -1,5 +1,7 @@
 """Пользовательские исключения для обработки ошибок."""
 
+from valutatrade_hub.core.formatting import fmt_amount
+
 
 class InsufficientFundsError(ValueError):
     """Исключение для случая недостаточности средств."""
@@ -16,20 +18,15 @@ class InsufficientFundsError(ValueError):
         self.available = available
         self.required = required
         self.code = code
+        super().__init__()
 
-        # Форматируем числа в зависимости от типа валюты
-        if code in ("BTC", "ETH"):
-            available_str = f"{available:.4f}"
-            required_str = f"{required:.4f}"
-        else:
-            available_str = f"{available:.2f}"
-            required_str = f"{required:.2f}"
-
-        message = (
-            f"Недостаточно средств: доступно {available_str} {code}, "
-            f"требуется {required_str} {code}"
+    def __str__(self) -> str:
+        # Сообщение форматируется лениво: только когда его читают
+        return (
+            f"Недостаточно средств: "
+            f"доступно {fmt_amount(self.available, self.code)} {self.code}, "
+            f"требуется {fmt_amount(self.required, self.code)} {self.code}"
         )
-        super().__init__(message)
 
 
 class CurrencyNotFoundError(ValueError):
@@ -43,8 +40,11 @@ class CurrencyNotFoundError(ValueError):
             code: Код валюты, которая не найдена
         """
         self.code = code
-        message = f"Неизвестная валюта '{code}'"
-        super().__init__(message)
+        super().__init__()
+
+    def __str__(self) -> str:
+        # Сообщение форматируется лениво: только когда его читают
+        return f"Неизвестная валюта '{self.code}'"
 
 
 class ApiRequestError(RuntimeError):
@@ -58,6 +58,8 @@ class ApiRequestError(RuntimeError):
             reason: Причина ошибки
         """
         self.reason = reason
-        message = f"Ошибка при обращении к внешнему API: {reason}"
-        super().__init__(message)
+        super().__init__()
 
+    def __str__(self) -> str:
+        # Сообщение форматируется лениво: только когда его читают
+        return f"Ошибка при обращении к внешнему API: {self.reason}"
@@ -0,0 +1,47 @@
+"""Общие помощники форматирования денежных величин."""
+
+from __future__ import annotations
+
+# Валюты, которые выводятся с повышенной точностью (4 знака вместо 2)
+CRYPTO_CODES: frozenset[str] = frozenset({"BTC", "ETH"})
+
+# Связанные форматтеры количеств: спецификация формата разбирается
+# один раз при импорте, а не при каждом вызове f-строки
+_FMT_CRYPTO = "{:.4f}".format
+_FMT_FIAT = "{:.2f}".format
+
+# Диспетчеризация форматтера по коду валюты одним поиском в словаре
+# вместо проверки принадлежности кортежу в каждой горячей точке
+_AMOUNT_FMT: dict[str, object] = dict.fromkeys(CRYPTO_CODES, _FMT_CRYPTO)
+
+
+# Таблица перевода для замены разделителя тысяч (один проход по строке
+# в C вместо поиска подстроки в str.replace)
+_THOUSANDS_TR = str.maketrans(",", " ")
+
+
+def fmt_money(value: float) -> str:
+    """
+    Отформатировать сумму с пробелом-разделителем тысяч.
+
+    Args:
+        value: Числовое значение
+
+    Returns:
+        Строка вида '45 000.00'
+    """
+    return f"{value:,.2f}".translate(_THOUSANDS_TR)
+
+
+def fmt_amount(value: float, code: str) -> str:
+    """
+    Отформатировать количество с точностью, зависящей от валюты.
+
+    Args:
+        value: Числовое значение
+        code: Код валюты (для криптовалют — 4 знака, иначе 2)
+
+    Returns:
+        Отформатированная строка
+    """
+    return _AMOUNT_FMT.get(code, _FMT_FIAT)(value)
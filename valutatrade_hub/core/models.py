@@ -3,16 +3,112 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
+import re
 import secrets
+import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
 from valutatrade_hub.core.exceptions import InsufficientFundsError
 
+# Встроенные курсы для офлайн-оценки портфеля: собираются один раз
+# при импорте; MappingProxyType защищает общий словарь от мутаций
+_EXCHANGE_RATES = MappingProxyType(
+    {
+        "USD": 1.0,
+        "EUR": 1.1,
+        "BTC": 45000.0,
+        "ETH": 3000.0,
+        "RUB": 0.011,
+    }
+)
+
+
+# Допустимый код валюты: 2-5 символов A-Z/0-9; один вызов fullmatch
+# объединяет проверки длины, алфавита и пробелов
+_CODE_RE = re.compile(r"[A-Z0-9]{2,5}")
+
+
+@lru_cache(maxsize=32)
+def _norm(code: str) -> str:
+    """
+    Нормализовать код валюты (strip + upper) с кешированием.
+
+    Args:
+        code: Код валюты в произвольном регистре
+
+    Returns:
+        Нормализованный код
+    """
+    return code.strip().upper()
+
+# Параметры scrypt: memory-hard KDF из стандартной библиотеки
+# (~16 МиБ памяти на вычисление, что резко удорожает перебор)
+_SCRYPT_N = 2**14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+# Префикс scrypt-хешей в хранилище: отличает их от устаревших
+# одно-раундовых sha256-хешей (64 hex-символа без префикса)
+_SCRYPT_PREFIX = "scrypt$"
+
+# Прототип sha256: .copy() клонирует готовый контекст одним memcpy,
+# минуя инициализацию OpenSSL-контекста при каждом вызове
+_SHA256_PROTO = hashlib.sha256()
+
+
+def _scrypt_digest(password: str, salt: bytes) -> bytes:
+    """
+    Вычислить scrypt-дайджест пароля с солью.
+
+    Args:
+        password: Пароль в открытом виде
+        salt: Байты соли пользователя
+
+    Returns:
+        Сырые байты дайджеста
+    """
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=_SCRYPT_N,
+        r=_SCRYPT_R,
+        p=_SCRYPT_P,
+    )
+
+
+def hash_password(password: str, salt: str) -> str:
+    """
+    Захешировать пароль для хранения.
+
+    Args:
+        password: Пароль в открытом виде
+        salt: Соль пользователя (hex-строка)
+
+    Returns:
+        Строка хеша с префиксом scrypt$
+    """
+    return _SCRYPT_PREFIX + _scrypt_digest(password, salt.encode("utf-8")).hex()
+
 
 class User:
     """Класс пользователя системы."""
 
+    # __slots__ вместо __dict__: меньше памяти на экземпляр и более
+    # быстрый доступ к атрибутам через дескрипторы слотов
+    __slots__ = (
+        "_user_id",
+        "_username",
+        "_hashed_password",
+        "_hashed_password_bytes",
+        "_salt",
+        "_salt_bytes",
+        "_registration_date",
+    )
+
     def __init__(
         self,
         user_id: int,
@@ -34,9 +130,34 @@ class User:
         self._user_id = user_id
         self.username = username
         self._hashed_password = hashed_password
+        # Сырые байты хеша декодируются один раз, а не при каждой проверке
+        self._hashed_password_bytes = self._decode_hash(hashed_password)
         self._salt = salt
+        # Байты соли кодируются один раз, а не при каждой проверке
+        self._salt_bytes = salt.encode("utf-8")
         self._registration_date = registration_date
 
+    @staticmethod
+    def _decode_hash(hashed_password: str) -> bytes | None:
+        """
+        Декодировать хранимый hex-хеш в байты.
+
+        Args:
+            hashed_password: Хеш из хранилища (с префиксом scrypt\\$ или
+                             устаревший sha256-hex)
+
+        Returns:
+            Байты дайджеста или None, если строка не является hex
+        """
+        if hashed_password.startswith(_SCRYPT_PREFIX):
+            hex_part = hashed_password[len(_SCRYPT_PREFIX):]
+        else:
+            hex_part = hashed_password
+        try:
+            return bytes.fromhex(hex_part)
+        except ValueError:
+            return None
+
     @property
     def user_id(self) -> int:
         return self._user_id
@@ -83,11 +204,12 @@ class User:
         if len(new_password) < 4:
             raise ValueError("Пароль должен быть не короче 4 символов")
 
-        self._salt = secrets.token_hex(8)
-        password_with_salt = new_password + self._salt
-        self._hashed_password = hashlib.sha256(
-            password_with_salt.encode("utf-8")
-        ).hexdigest()
+        # 16 байт соли (128 бит) — современный минимум для KDF
+        self._salt = secrets.token_hex(16)
+        self._salt_bytes = self._salt.encode("utf-8")
+        digest = _scrypt_digest(new_password, self._salt_bytes)
+        self._hashed_password = _SCRYPT_PREFIX + digest.hex()
+        self._hashed_password_bytes = digest
 
     def verify_password(self, password: str) -> bool:
         """
@@ -99,15 +221,28 @@ class User:
         Returns:
             True если пароль совпадает, иначе False
         """
-        password_with_salt = password + self._salt
-        hashed_input = hashlib.sha256(
-            password_with_salt.encode("utf-8")
-        ).hexdigest()
-        return hashed_input == self._hashed_password
+        if self._hashed_password.startswith(_SCRYPT_PREFIX):
+            candidate = _scrypt_digest(password, self._salt_bytes)
+        else:
+            # Устаревший формат: один раунд sha256(password + salt).
+            # Цепочка update-вызовов эквивалентна хешированию
+            # конкатенации, но не собирает промежуточную строку
+            h = _SHA256_PROTO.copy()
+            h.update(password.encode("utf-8"))
+            h.update(self._salt_bytes)
+            candidate = h.digest()
+
+        stored = self._hashed_password_bytes
+        if stored is None:
+            # Хеш в хранилище не hex — сравниваем строковые представления
+            return hmac.compare_digest(candidate.hex(), self._hashed_password)
+        return hmac.compare_digest(candidate, stored)
 
 class Wallet:
     """Класс кошелька пользователя для одной конкретной валюты."""
 
+    __slots__ = ("_currency_code", "_balance")
+
     def __init__(
         self,
         currency_code: str,
@@ -125,7 +260,9 @@ class Wallet:
         """
         if not currency_code or not currency_code.strip():
             raise ValueError("Код валюты не может быть пустым")
-        self._currency_code = currency_code.strip().upper()
+        # Интернированный код делает поиск по словарям портфеля
+        # сравнением указателей
+        self._currency_code = sys.intern(_norm(currency_code))
         self.balance = balance  # Используем сеттер для валидации
 
     @property
@@ -169,13 +306,17 @@ class Wallet:
             TypeError: Если сумма не является числом
             ValueError: Если сумма не положительная
         """
-        if not isinstance(amount, (int, float)):
-            raise TypeError("Сумма должна быть числом (int или float)")
+        # Быстрая проверка по точному классу; подклассы (например, bool)
+        # уходят на общий isinstance-путь
+        if amount.__class__ is not float and amount.__class__ is not int:
+            if not isinstance(amount, (int, float)):
+                raise TypeError("Сумма должна быть числом (int или float)")
 
         if amount <= 0:
             raise ValueError("Сумма должна быть положительным числом")
 
-        self._balance += float(amount)
+        # _balance всегда float, поэтому float(amount) избыточен
+        self._balance += amount
 
     def withdraw(self, amount: float) -> None:
         """
@@ -189,8 +330,11 @@ class Wallet:
             ValueError: Если сумма не положительная
             InsufficientFundsError: Если недостаточно средств
         """
-        if not isinstance(amount, (int, float)):
-            raise TypeError("Сумма должна быть числом (int или float)")
+        # Быстрая проверка по точному классу; подклассы (например, bool)
+        # уходят на общий isinstance-путь
+        if amount.__class__ is not float and amount.__class__ is not int:
+            if not isinstance(amount, (int, float)):
+                raise TypeError("Сумма должна быть числом (int или float)")
 
         if amount <= 0:
             raise ValueError("Сумма должна быть положительным числом")
@@ -200,7 +344,8 @@ class Wallet:
                 self._balance, amount, self._currency_code
             )
 
-        self._balance -= float(amount)
+        # _balance всегда float, поэтому float(amount) избыточен
+        self._balance -= amount
 
     def get_balance_info(self) -> dict:
         """
@@ -218,6 +363,8 @@ class Wallet:
 class Portfolio:
     """Класс управления всеми кошельками одного пользователя."""
 
+    __slots__ = ("_user_id", "_wallets", "_wallets_view", "_user")
+
     def __init__(
         self,
         user_id: int,
@@ -234,6 +381,9 @@ class Portfolio:
         """
         self._user_id = user_id
         self._wallets: dict[str, Wallet] = wallets.copy() if wallets else {}
+        # Неизменяемое представление поверх живого словаря: отдаётся
+        # наружу без копирования при каждом обращении
+        self._wallets_view = MappingProxyType(self._wallets)
         self._user = user
 
     @property
@@ -245,8 +395,8 @@ class Portfolio:
         return self._user
 
     @property
-    def wallets(self) -> dict[str, Wallet]:
-        return self._wallets.copy()
+    def wallets(self) -> MappingProxyType:
+        return self._wallets_view
 
     def add_currency(self, currency_code: str) -> Wallet:
         """
@@ -261,7 +411,7 @@ class Portfolio:
         Raises:
             ValueError: Если валюта уже существует в портфеле
         """
-        currency_code = currency_code.strip().upper()
+        currency_code = sys.intern(_norm(currency_code))
         if currency_code in self._wallets:
             raise ValueError(
                 f"Валюта {currency_code} уже существует в портфеле"
@@ -281,7 +431,7 @@ class Portfolio:
         Returns:
             Объект Wallet или None, если кошелёк не найден
         """
-        currency_code = currency_code.strip().upper()
+        currency_code = sys.intern(_norm(currency_code))
         return self._wallets.get(currency_code)
 
     def get_total_value(self, base_currency: str = "USD") -> float:
@@ -297,45 +447,29 @@ class Portfolio:
         Raises:
             ValueError: Если базовая валюта не найдена в курсах
         """
-        exchange_rates: dict[str, float] = {
-            "USD": 1.0,
-            "EUR": 1.1,
-            "BTC": 45000.0,
-            "ETH": 3000.0,
-            "RUB": 0.011,
-        }
-
-        base_currency = base_currency.strip().upper()
-        if base_currency not in exchange_rates:
+        base_rate = _EXCHANGE_RATES.get(_norm(base_currency))
+        if base_rate is None:
             raise ValueError(
-                f"Курс для базовой валюты {base_currency} не найден"
+                f"Курс для базовой валюты {_norm(base_currency)} не найден"
             )
 
-        total_value = 0.0
-
-        for currency_code, wallet in self._wallets.items():
-            currency_code = currency_code.upper()
-            balance = wallet.balance
-
-            if currency_code == base_currency:
-                total_value += balance
-            else:
-                if currency_code in exchange_rates:
-                    value_in_usd = balance * exchange_rates[currency_code]
-                    if base_currency == "USD":
-                        total_value += value_in_usd
-                    else:
-                        total_value += value_in_usd / exchange_rates[base_currency]
-                else:
-                    # Пропускаем валюту без курса
-                    continue
+        # Безветвистая свёртка: курс базовой валюты вынесен за цикл,
+        # валюты без курса дают вклад 0.0; коды кошельков уже
+        # нормализованы при создании
+        rates_get = _EXCHANGE_RATES.get
+        total_value = sum(
+            wallet._balance * rates_get(wallet._currency_code, 0.0)
+            for wallet in self._wallets.values()
+        )
 
-        return total_value
+        return total_value / base_rate
 
 
 class Currency(ABC):
     """Абстрактный базовый класс для валют."""
 
+    __slots__ = ("_name", "_code", "_display_cache")
+
     def __init__(self, name: str, code: str) -> None:
         """
         Инициализация валюты.
@@ -368,6 +502,7 @@ class Currency(ABC):
         if not value or not value.strip():
             raise ValueError("Имя валюты не может быть пустым")
         self._name = value.strip()
+        self._display_cache = None
 
     @property
     def code(self) -> str:
@@ -392,13 +527,13 @@ class Currency(ABC):
         if not value:
             raise ValueError("Код валюты не может быть пустым")
 
-        if len(value) < 2 or len(value) > 5:
-            raise ValueError("Код валюты должен содержать от 2 до 5 символов")
-
-        if " " in value:
-            raise ValueError("Код валюты не может содержать пробелы")
+        if _CODE_RE.fullmatch(value) is None:
+            raise ValueError(
+                "Код валюты должен содержать от 2 до 5 символов A-Z/0-9"
+            )
 
-        self._code = value
+        self._code = sys.intern(value)
+        self._display_cache = None
 
     @abstractmethod
     def get_display_info(self) -> str:
@@ -414,6 +549,8 @@ class Currency(ABC):
 class FiatCurrency(Currency):
     """Класс фиатной валюты."""
 
+    __slots__ = ("_issuing_country",)
+
     def __init__(self, name: str, code: str, issuing_country: str) -> None:
         """
         Инициализация фиатной валюты.
@@ -466,6 +603,8 @@ class FiatCurrency(Currency):
 class CryptoCurrency(Currency):
     """Класс криптовалюты."""
 
+    __slots__ = ("_algorithm", "_market_cap")
+
     def __init__(
         self,
         name: str,
@@ -508,6 +647,7 @@ class CryptoCurrency(Currency):
         if not value or not value.strip():
             raise ValueError("Алгоритм не может быть пустым")
         self._algorithm = value.strip()
+        self._display_cache = None
 
     @property
     def market_cap(self) -> float:
@@ -531,6 +671,7 @@ class CryptoCurrency(Currency):
         if value < 0:
             raise ValueError("Рыночная капитализация не может быть отрицательной")
         self._market_cap = float(value)
+        self._display_cache = None
 
     def get_display_info(self) -> str:
         """
@@ -540,6 +681,10 @@ class CryptoCurrency(Currency):
             Строковое представление в формате:
             "[CRYPTO] CODE — Name (Algo: Algorithm, MCAP: MarketCap)"
         """
+        # Кеш сбрасывается сеттерами при изменении любого атрибута
+        if self._display_cache is not None:
+            return self._display_cache
+
         # Форматируем капитализацию в научной нотации для больших чисел
         if self._market_cap >= 1e12:
             mcap_str = f"{self._market_cap / 1e12:.2f}e12"
@@ -550,7 +695,8 @@ class CryptoCurrency(Currency):
         else:
             mcap_str = f"{self._market_cap:.2f}"
 
-        return (
+        self._display_cache = (
             f"[CRYPTO] {self._code} — {self._name} "
             f"(Algo: {self._algorithm}, MCAP: {mcap_str})"
         )
+        return self._display_cache
@@ -2,21 +2,30 @@
 
 from __future__ import annotations
 
-import hashlib
 import secrets
+import time
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from typing import NamedTuple
 
 from valutatrade_hub.core.currencies import get_currency
 from valutatrade_hub.core.exceptions import (
     ApiRequestError,
     CurrencyNotFoundError,
 )
-from valutatrade_hub.core.models import Portfolio, User, Wallet
+from valutatrade_hub.core.models import (
+    Portfolio,
+    User,
+    Wallet,
+    hash_password,
+)
 from valutatrade_hub.core.utils import (
+    FALLBACK_PAIRS,
     PORTFOLIOS_FILE,
     RATES_FILE,
     USERS_FILE,
     get_exchange_rate,
+    invalidate_rate_memo,
     load_json,
     save_json,
     validate_amount,
@@ -27,23 +36,79 @@ from valutatrade_hub.infra.settings import SettingsLoader
 
 _settings = SettingsLoader()
 
-_current_user: User | None = None
-_current_portfolio: Portfolio | None = None
+# Контекстные переменные сессии: корректны и под потоками/asyncio,
+# чтение — O(1) без обращения к глобальному словарю модуля
+_current_user: ContextVar[User | None] = ContextVar(
+    "_current_user", default=None
+)
+_current_portfolio: ContextVar[Portfolio | None] = ContextVar(
+    "_current_portfolio", default=None
+)
+
+
+# Производные индексы поверх списков, которые кеширует load_json.
+# Индекс привязан к конкретному объекту списка: пока файл не менялся,
+# load_json возвращает тот же объект, поэтому проверка идентичности
+# "is" заменяет повторную проверку mtime. При изменении файла приходит
+# новый список и индекс перестраивается один раз.
+_users_index: dict[str, dict] = {}
+_users_index_source: list | None = None
+_max_user_id = 0
+
+_portfolios_index: dict[int, dict] = {}
+_portfolios_index_source: list | None = None
+
+
+def _get_users_index(users_data: list) -> dict[str, dict]:
+    """Вернуть индекс username (casefold) → запись пользователя."""
+    global _users_index, _users_index_source, _max_user_id
+    if users_data is not _users_index_source:
+        # casefold корректнее lower для не-ASCII имён и выполняется
+        # один раз на имя при построении индекса
+        _users_index = {
+            u.get("username", "").casefold(): u for u in users_data
+        }
+        _max_user_id = max(
+            (u.get("user_id", 0) for u in users_data), default=0
+        )
+        _users_index_source = users_data
+    return _users_index
+
+
+def _get_portfolios_index(portfolios_data: list) -> dict[int, dict]:
+    """Вернуть индекс user_id → запись портфеля."""
+    global _portfolios_index, _portfolios_index_source
+    if portfolios_data is not _portfolios_index_source:
+        _portfolios_index = {p.get("user_id"): p for p in portfolios_data}
+        _portfolios_index_source = portfolios_data
+    return _portfolios_index
+
+
+class PortfolioInfo(NamedTuple):
+    """Сводка портфеля текущего пользователя для отображения."""
+
+    user: User
+    portfolio: Portfolio
+    base_currency: str
+    wallets_info: list[dict]
+    total_value: float
 
 
 def get_current_user() -> User | None:
     """Получить текущего залогиненного пользователя."""
-    return _current_user
+    return _current_user.get()
 
 
 def get_current_portfolio() -> Portfolio | None:
     """Получить портфель текущего пользователя."""
-    return _current_portfolio
+    return _current_portfolio.get()
 
 
 def require_login() -> User:
     """Проверить, что пользователь залогинен."""
-    user = get_current_user()
+    # ContextVar читается напрямую: проверка стоит на каждой операции,
+    # и лишний кадр вызова get_current_user здесь ни к чему
+    user = _current_user.get()
     if user is None:
         raise RuntimeError("Необходимо войти в систему")
     return user
@@ -51,7 +116,7 @@ def require_login() -> User:
 
 def require_portfolio() -> Portfolio:
     """Проверить, что портфель загружен."""
-    portfolio = get_current_portfolio()
+    portfolio = _current_portfolio.get()
     if portfolio is None:
         raise RuntimeError("Портфель не загружен")
     return portfolio
@@ -72,25 +137,27 @@ def register_user(username: str, password: str) -> tuple[User, int]:
     Raises:
         ValueError: Если имя пользователя уже занято или пароль слишком короткий
     """
+    global _max_user_id
+
     if len(password) < 4:
         raise ValueError("Пароль должен быть не короче 4 символов")
 
     users_data = load_json(USERS_FILE)
 
-    username_lower = username.lower()
-    for user_data in users_data:
-        if user_data.get("username", "").lower() == username_lower:
-            raise ValueError(f"Имя пользователя '{username}' уже занято")
-
-    if users_data:
-        user_id = max(user.get("user_id", 0) for user in users_data) + 1
-    else:
-        user_id = 1
-    salt = secrets.token_hex(8)
-    password_with_salt = password + salt
-    hashed_password = hashlib.sha256(
-        password_with_salt.encode("utf-8")
-    ).hexdigest()
+    username_key = username.casefold()
+    users_index = _get_users_index(users_data)
+    if username_key in users_index:
+        raise ValueError(f"Имя пользователя '{username}' уже занято")
+
+    # Максимальный id поддерживается инкрементально при загрузке
+    # индекса, поэтому не пересчитывается по всему списку
+    user_id = _max_user_id + 1
+    # Scrypt (memory-hard KDF) вместо одно-раундового sha256: перебор
+    # хешей становится дорогим; старые sha256-записи продолжают
+    # проверяться через ветку обратной совместимости в verify_password
+    # 16 байт соли (128 бит) — современный минимум для KDF
+    salt = secrets.token_hex(16)
+    hashed_password = hash_password(password, salt)
 
     # Создаём объект User
     registration_date = datetime.now()
@@ -110,6 +177,9 @@ def register_user(username: str, password: str) -> tuple[User, int]:
         "registration_date": registration_date.isoformat(),
     }
     users_data.append(user_data)
+    # Дописываем индекс на месте: список остался тем же объектом
+    users_index[username_key] = user_data
+    _max_user_id = user_id
     save_json(USERS_FILE, users_data)
 
     # Создаём пустой портфель в portfolios.json
@@ -117,12 +187,12 @@ def register_user(username: str, password: str) -> tuple[User, int]:
     # Если portfolios.json был объектом, преобразуем в список
     if isinstance(portfolios_data, dict):
         portfolios_data = []
-    portfolios_data.append(
-        {
-            "user_id": user_id,
-            "wallets": {},
-        }
-    )
+    portfolio_record = {
+        "user_id": user_id,
+        "wallets": {},
+    }
+    portfolios_data.append(portfolio_record)
+    _get_portfolios_index(portfolios_data)[user_id] = portfolio_record
     save_json(PORTFOLIOS_FILE, portfolios_data)
 
     return user, user_id
@@ -146,17 +216,15 @@ def load_portfolio_from_json(user_id: int) -> Portfolio:
     if isinstance(portfolios_data, dict):
         portfolios_data = []
 
-    # Ищем портфель пользователя
-    portfolio_data = None
-    for p in portfolios_data:
-        if p.get("user_id") == user_id:
-            portfolio_data = p
-            break
+    # Ищем портфель пользователя по индексу
+    portfolios_index = _get_portfolios_index(portfolios_data)
+    portfolio_data = portfolios_index.get(user_id)
 
     if portfolio_data is None:
         # Создаём пустой портфель, если не найден
         portfolio_data = {"user_id": user_id, "wallets": {}}
         portfolios_data.append(portfolio_data)
+        portfolios_index[user_id] = portfolio_data
         save_json(PORTFOLIOS_FILE, portfolios_data)
 
     # Создаём словарь кошельков
@@ -186,18 +254,11 @@ def login_user(username: str, password: str) -> User:
     Raises:
         ValueError: Если пользователь не найден или неверный пароль
     """
-    global _current_user, _current_portfolio
-
     # Загружаем список пользователей
     users_data = load_json(USERS_FILE)
 
-    # Ищем пользователя по username
-    user_data = None
-    username_lower = username.lower()
-    for u in users_data:
-        if u.get("username", "").lower() == username_lower:
-            user_data = u
-            break
+    # Ищем пользователя по индексу
+    user_data = _get_users_index(users_data).get(username.casefold())
 
     if user_data is None:
         raise ValueError(f"Пользователь '{username}' не найден")
@@ -221,8 +282,8 @@ def login_user(username: str, password: str) -> User:
     portfolio = load_portfolio_from_json(user.user_id)
 
     # Устанавливаем текущего пользователя и портфель
-    _current_user = user
-    _current_portfolio = portfolio
+    _current_user.set(user)
+    _current_portfolio.set(portfolio)
 
     return user
 
@@ -231,12 +292,11 @@ def logout_user() -> None:
     """
     Выйти из системы (очистить сессию).
     """
-    global _current_user, _current_portfolio
-    _current_user = None
-    _current_portfolio = None
+    _current_user.set(None)
+    _current_portfolio.set(None)
 
 
-def get_portfolio_info(base_currency: str | None = None) -> dict:
+def get_portfolio_info(base_currency: str | None = None) -> PortfolioInfo:
     """
     Получить информацию о портфеле текущего пользователя.
 
@@ -245,21 +305,9 @@ def get_portfolio_info(base_currency: str | None = None) -> dict:
                        (если None, берётся из конфигурации)
 
     Returns:
-        Словарь с информацией о портфеле:
-        {
-            "user": User,
-            "portfolio": Portfolio,
-            "base_currency": str,
-            "wallets_info": [
-                {
-                    "currency_code": str,
-                    "balance": float,
-                    "value_in_base": float
-                },
-                ...
-            ],
-            "total_value": float
-        }
+        PortfolioInfo с полями user, portfolio, base_currency,
+        wallets_info (список словарей currency_code/balance/value_in_base)
+        и total_value
 
     Raises:
         RuntimeError: Если пользователь не залогинен
@@ -285,7 +333,9 @@ def get_portfolio_info(base_currency: str | None = None) -> dict:
         raise ValueError(f"Неизвестная базовая валюта '{base_currency}'")
 
     wallets_info = []
-    total_value = 0.0
+    # Локальные ссылки на горячие вызовы убирают поиск имён в цикле
+    append_info = wallets_info.append
+    rate_of = get_exchange_rate
 
     for currency_code, wallet in portfolio.wallets.items():
         balance = wallet.balance
@@ -294,25 +344,28 @@ def get_portfolio_info(base_currency: str | None = None) -> dict:
             if currency_code == base_currency:
                 value_in_base = balance
             else:
-                rate = get_exchange_rate(currency_code, base_currency, rates_data)
-                value_in_base = balance * rate
+                value_in_base = balance * rate_of(
+                    currency_code, base_currency, rates_data
+                )
 
-            wallets_info.append(
+            append_info(
                 {
                     "currency_code": currency_code,
                     "balance": balance,
                     "value_in_base": value_in_base,
                 }
             )
-            total_value += value_in_base
 
-    return {
-        "user": user,
-        "portfolio": portfolio,
-        "base_currency": base_currency,
-        "wallets_info": wallets_info,
-        "total_value": total_value,
-    }
+    # Итог — один C-уровневый проход по уже собранным значениям
+    total_value = sum(w["value_in_base"] for w in wallets_info)
+
+    return PortfolioInfo(
+        user=user,
+        portfolio=portfolio,
+        base_currency=base_currency,
+        wallets_info=wallets_info,
+        total_value=total_value,
+    )
 
 
 def save_portfolio_to_json(portfolio: Portfolio) -> None:
@@ -331,14 +384,9 @@ def save_portfolio_to_json(portfolio: Portfolio) -> None:
     if isinstance(portfolios_data, dict):
         portfolios_data = []
 
-    # Ищем портфель пользователя
-    portfolio_data = None
-    portfolio_index = None
-    for i, p in enumerate(portfolios_data):
-        if p.get("user_id") == portfolio.user_id:
-            portfolio_data = p
-            portfolio_index = i
-            break
+    # Ищем портфель пользователя по индексу
+    portfolios_index = _get_portfolios_index(portfolios_data)
+    portfolio_data = portfolios_index.get(portfolio.user_id)
 
     # Создаём словарь кошельков из объектов Wallet
     wallets_data: dict[str, dict[str, float]] = {}
@@ -347,14 +395,14 @@ def save_portfolio_to_json(portfolio: Portfolio) -> None:
 
     # Обновляем или создаём запись портфеля
     if portfolio_data is not None:
-        portfolios_data[portfolio_index]["wallets"] = wallets_data
+        portfolio_data["wallets"] = wallets_data
     else:
-        portfolios_data.append(
-            {
-                "user_id": portfolio.user_id,
-                "wallets": wallets_data,
-            }
-        )
+        portfolio_data = {
+            "user_id": portfolio.user_id,
+            "wallets": wallets_data,
+        }
+        portfolios_data.append(portfolio_data)
+        portfolios_index[portfolio.user_id] = portfolio_data
 
     # Безопасная операция: запись (модификация уже выполнена в памяти)
     save_json(PORTFOLIOS_FILE, portfolios_data)
@@ -434,9 +482,8 @@ def buy_currency(
     wallet.deposit(amount)
     new_balance = wallet.balance
 
-    # Обновляем глобальный портфель
-    global _current_portfolio
-    _current_portfolio = portfolio
+    # Обновляем портфель текущей сессии
+    _current_portfolio.set(portfolio)
 
     save_portfolio_to_json(portfolio)
 
@@ -516,13 +563,8 @@ def sell_currency(
             f"Добавьте валюту: она создаётся автоматически при первой покупке."
         )
 
-    old_balance = wallet.balance
-
-    # Уменьшаем баланс (выбросит InsufficientFundsError, если недостаточно средств)
-    wallet.withdraw(amount)
-    new_balance = wallet.balance
-
-    # Загружаем курсы для расчёта выручки (безопасная операция: чтение)
+    # Загружаем курсы до списания: если курс получить не удалось,
+    # баланс кошелька остаётся нетронутым (безопасная операция: чтение)
     rates_data = load_json(RATES_FILE)
 
     try:
@@ -532,19 +574,21 @@ def sell_currency(
             f"Не удалось получить курс для {currency}→{base_currency}"
         ) from e
 
+    old_balance = wallet.balance
+
+    # Уменьшаем баланс (выбросит InsufficientFundsError, если недостаточно средств)
+    wallet.withdraw(amount)
+    new_balance = wallet.balance
+
     # Опционально: начисляем эквивалент в базовой валюте
-    # Если есть кошелёк базовой валюты, начисляем туда выручку
+    # Если кошелька базовой валюты нет, выручка идёт только в отчёт
+    revenue_in_base = amount * rate
     base_wallet = portfolio.get_wallet(base_currency)
     if base_wallet is not None:
-        revenue_in_base = amount * rate
         base_wallet.deposit(revenue_in_base)
-    else:
-        # Если кошелька базовой валюты нет, просто рассчитываем выручку для отчёта
-        revenue_in_base = amount * rate
 
-    # Обновляем глобальный портфель
-    global _current_portfolio
-    _current_portfolio = portfolio
+    # Обновляем портфель текущей сессии
+    _current_portfolio.set(portfolio)
 
     save_portfolio_to_json(portfolio)
 
@@ -582,6 +626,35 @@ def _is_rate_fresh(updated_at_str: str, max_age_seconds: int | None = None) -> b
         return False
 
 
+def _is_rate_record_fresh(
+    rate_data: dict, max_age_seconds: int | None = None
+) -> bool:
+    """
+    Проверить, свежая ли запись курса.
+
+    Числовая метка updated_at_ts сравнивается одним вычитанием без
+    создания объектов datetime; разбор ISO-строки остаётся запасным
+    путём для записей без метки.
+
+    Args:
+        rate_data: Запись курса из rates.json
+        max_age_seconds: Максимальный возраст курса в секундах
+                         (если None, берётся из конфигурации)
+
+    Returns:
+        True если курс свежий, иначе False
+    """
+    updated_at_ts = rate_data.get("updated_at_ts")
+    if updated_at_ts is not None:
+        if max_age_seconds is None:
+            max_age_seconds = _settings.get("rates_ttl_seconds", 300)
+        try:
+            return (time.time() - updated_at_ts) < max_age_seconds
+        except TypeError:
+            return False
+    return _is_rate_fresh(rate_data.get("updated_at", ""), max_age_seconds)
+
+
 def _update_rate_in_cache(
     from_currency: str, to_currency: str, rate: float, rates_data: dict
 ) -> None:
@@ -599,12 +672,27 @@ def _update_rate_in_cache(
     """
     rate_key = f"{from_currency}_{to_currency}"
     now = datetime.now()
-    # Модификация в памяти
+    now_iso = now.isoformat()
+    now_ts = now.timestamp()
+    # Модификация в памяти; числовая метка дублирует ISO-строку,
+    # чтобы проверка свежести не разбирала дату заново
     rates_data[rate_key] = {
         "rate": rate,
-        "updated_at": now.isoformat(),
+        "updated_at": now_iso,
+        "updated_at_ts": now_ts,
     }
-    rates_data["last_refresh"] = now.isoformat()
+    # Зеркальная запись: обратная пара обновляется тем же моментом,
+    # чтобы get_rate в обе стороны находил свежий прямой курс вместо
+    # ветки с обратным поиском
+    if rate:
+        rates_data[f"{to_currency}_{from_currency}"] = {
+            "rate": 1.0 / rate,
+            "updated_at": now_iso,
+            "updated_at_ts": now_ts,
+        }
+    rates_data["last_refresh"] = now_iso
+    # Объект rates_data изменён на месте — мемо-кеш курсов устарел
+    invalidate_rate_memo()
     # Безопасная операция: запись
     save_json(RATES_FILE, rates_data)
 
@@ -623,26 +711,18 @@ def _get_rate_from_stub(from_currency: str, to_currency: str) -> float:
     Raises:
         ValueError: Если курс не найден
     """
-    # Фиксированные курсы (заглушка)
-    fallback_rates: dict[str, float] = {
-        "USD": 1.0,
-        "EUR": 1.1,
-        "BTC": 45000.0,
-        "ETH": 3000.0,
-        "RUB": 0.011,
-    }
-
     # Если валюты одинаковые
     if from_currency == to_currency:
         return 1.0
 
-    # Конвертируем через USD
-    if from_currency in fallback_rates and to_currency in fallback_rates:
-        from_to_usd = fallback_rates[from_currency]
-        usd_to_to = 1.0 / fallback_rates[to_currency]
-        return from_to_usd * usd_to_to
+    # Кросс-курс из матрицы заглушки, посчитанной при импорте
+    rate = FALLBACK_PAIRS.get((from_currency, to_currency))
+    if rate is None:
+        raise ValueError(
+            f"Курс {from_currency}→{to_currency} не найден в заглушке"
+        )
 
-    raise ValueError(f"Курс {from_currency}→{to_currency} не найден в заглушке")
+    return rate
 
 
 def get_rate(from_currency: str, to_currency: str) -> dict:
@@ -706,7 +786,7 @@ def get_rate(from_currency: str, to_currency: str) -> dict:
         rate_data = rates_data[rate_key]
         rate = float(rate_data["rate"])
         updated_at_str = rate_data.get("updated_at")
-        if updated_at_str and _is_rate_fresh(updated_at_str):
+        if _is_rate_record_fresh(rate_data):
             needs_update = False
 
     # Если курс не свежий или не найден, обновляем
@@ -723,7 +803,7 @@ def get_rate(from_currency: str, to_currency: str) -> dict:
                 reverse_rate = float(reverse_rate_data["rate"])
                 rate = 1.0 / reverse_rate
                 updated_at_str = reverse_rate_data.get("updated_at")
-                if updated_at_str and _is_rate_fresh(updated_at_str):
+                if _is_rate_record_fresh(reverse_rate_data):
                     # Обновляем прямой курс на основе обратного
                     _update_rate_in_cache(from_currency, to_currency, rate, rates_data)
                     updated_at_str = datetime.now().isoformat()
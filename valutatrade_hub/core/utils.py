@@ -1,6 +1,7 @@
 """Вспомогательные функции."""
 
 import json
+import os
 from pathlib import Path
 from typing import Any
 
@@ -14,11 +15,19 @@ USERS_FILE = DATA_DIR / "users.json"
 PORTFOLIOS_FILE = DATA_DIR / "portfolios.json"
 RATES_FILE = DATA_DIR / "rates.json"
 
+# Кеш разобранных JSON-файлов: {путь: (st_mtime_ns, данные)}.
+# Пока файл не изменился на диске, повторные load_json возвращают
+# уже разобранный объект без чтения и json.loads
+_JSON_CACHE: dict[Path, tuple[int, Any]] = {}
+
 
 def load_json(file_path: Path) -> Any:
     """
     Загрузить данные из JSON файла.
 
+    Результат кешируется по mtime файла: повторные вызовы для
+    неизменившегося файла возвращают общий разобранный объект.
+
     Args:
         file_path: Путь к JSON файлу
 
@@ -26,10 +35,12 @@ def load_json(file_path: Path) -> Any:
         Данные из файла (dict, list и т.д.)
 
     Raises:
-        FileNotFoundError: Если файл не найден
         json.JSONDecodeError: Если файл содержит некорректный JSON
     """
-    if not file_path.exists():
+    # os.stat совмещает проверку существования с получением mtime
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
         # Создаём файл с пустыми данными
         file_path.parent.mkdir(parents=True, exist_ok=True)
         if "users" in str(file_path):
@@ -39,21 +50,38 @@ def load_json(file_path: Path) -> Any:
         save_json(file_path, default_data)
         return default_data
 
+    cached = _JSON_CACHE.get(file_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
     with open(file_path, encoding="utf-8") as f:
-        return json.load(f)
+        data = json.load(f)
+    _JSON_CACHE[file_path] = (mtime_ns, data)
+    return data
 
 
 def save_json(file_path: Path, data: Any) -> None:
     """
     Сохранить данные в JSON файл.
 
+    Запись атомарна: данные пишутся во временный файл, который затем
+    заменяет целевой одним os.replace, поэтому читатели не увидят
+    частично записанный JSON. Кеш load_json обновляется на месте.
+
     Args:
         file_path: Путь к JSON файлу
         data: Данные для сохранения
     """
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+        # fsync до замены: после os.replace на диске гарантированно
+        # либо старая, либо полная новая версия файла
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+    _JSON_CACHE[file_path] = (os.stat(file_path).st_mtime_ns, data)
 
 
 def validate_amount(amount: Any) -> float:
@@ -104,12 +132,46 @@ def validate_currency_code(currency_code: Any) -> str:
     return currency_code
 
 
+# Фиксированные курсы-заглушки к USD и полная матрица кросс-курсов:
+# все пары считаются один раз при импорте, поиск — один запрос по
+# словарю вместо двух запросов и деления на каждый вызов
+_FALLBACK_USD_RATES: dict[str, float] = {
+    "USD": 1.0,
+    "EUR": 1.1,
+    "BTC": 45000.0,
+    "ETH": 3000.0,
+    "RUB": 0.011,
+}
+FALLBACK_PAIRS: dict[tuple[str, str], float] = {
+    (frm, to): frm_rate / to_rate
+    for frm, frm_rate in _FALLBACK_USD_RATES.items()
+    for to, to_rate in _FALLBACK_USD_RATES.items()
+}
+
+# Мемо-кеш курсов для конкретного загруженного rates_data: пока
+# load_json возвращает тот же объект, повторные запросы одной пары
+# не повторяют нормализацию ключей и кросс-расчёт. Привязка по
+# идентичности объекта; сбрасывается при смене источника и явно —
+# через invalidate_rate_memo() после мутации rates_data на месте
+_rate_memo: dict[tuple[str, str], float] = {}
+_rate_memo_source: dict | None = None
+
+
+def invalidate_rate_memo() -> None:
+    """Сбросить мемо-кеш курсов после изменения rates_data на месте."""
+    global _rate_memo_source
+    _rate_memo_source = None
+
+
 def get_exchange_rate(
     from_currency: str, to_currency: str, rates_data: dict | None = None
 ) -> float:
     """
     Получить курс обмена между валютами.
 
+    Найденные курсы мемоизируются по паре валют, пока передаётся тот
+    же объект rates_data.
+
     Args:
         from_currency: Исходная валюта
         to_currency: Целевая валюта
@@ -121,9 +183,15 @@ def get_exchange_rate(
     Raises:
         ValueError: Если курс не найден
     """
+    global _rate_memo, _rate_memo_source
+
     if rates_data is None:
         rates_data = load_json(RATES_FILE)
 
+    if rates_data is not _rate_memo_source:
+        _rate_memo = {}
+        _rate_memo_source = rates_data
+
     from_currency = validate_currency_code(from_currency)
     to_currency = validate_currency_code(to_currency)
 
@@ -131,32 +199,26 @@ def get_exchange_rate(
     if from_currency == to_currency:
         return 1.0
 
+    pair = (from_currency, to_currency)
+    rate = _rate_memo.get(pair)
+    if rate is not None:
+        return rate
+
     # Пытаемся найти прямой курс
     rate_key = f"{from_currency}_{to_currency}"
+    reverse_key = f"{to_currency}_{from_currency}"
     if rate_key in rates_data and "rate" in rates_data[rate_key]:
-        return float(rates_data[rate_key]["rate"])
-
+        rate = float(rates_data[rate_key]["rate"])
     # Пытаемся найти обратный курс
-    reverse_key = f"{to_currency}_{from_currency}"
-    if reverse_key in rates_data and "rate" in rates_data[reverse_key]:
-        return 1.0 / float(rates_data[reverse_key]["rate"])
-
-    # Если не нашли, используем фиксированные курсы (заглушка)
-    fallback_rates: dict[str, float] = {
-        "USD": 1.0,
-        "EUR": 1.1,
-        "BTC": 45000.0,
-        "ETH": 3000.0,
-        "RUB": 0.011,
-    }
-
-    # Конвертируем через USD
-    if from_currency in fallback_rates and to_currency in fallback_rates:
-        # Сначала в USD, потом в целевую валюту
-        from_to_usd = fallback_rates[from_currency]
-        usd_to_to = 1.0 / fallback_rates[to_currency]
-        return from_to_usd * usd_to_to
-
-    raise ValueError(
-        f"Курс обмена {from_currency} -> {to_currency} не найден"
-    )
+    elif reverse_key in rates_data and "rate" in rates_data[reverse_key]:
+        rate = 1.0 / float(rates_data[reverse_key]["rate"])
+    else:
+        # Если не нашли, используем матрицу кросс-курсов заглушки
+        rate = FALLBACK_PAIRS.get((from_currency, to_currency))
+        if rate is None:
+            raise ValueError(
+                f"Курс обмена {from_currency} -> {to_currency} не найден"
+            )
+
+    _rate_memo[pair] = rate
+    return rate
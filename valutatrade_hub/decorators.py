@@ -3,15 +3,21 @@
 from __future__ import annotations
 
 import functools
+import logging
 from collections.abc import Callable
-from datetime import datetime
 from typing import Any
 
+from valutatrade_hub.core.formatting import fmt_amount
 from valutatrade_hub.logging_config import get_logger
 
 # Логгер для действий
 _action_logger = get_logger("actions")
 
+# Кешированная ссылка на usecases.get_current_user: связывается лениво
+# при первом вызове (импорт наверху создал бы цикл с usecases),
+# дальше горячий путь обходится без выполнения import-утверждения
+_get_current_user: Callable | None = None
+
 
 def log_action(action: str, verbose: bool = False) -> Callable:
     """
@@ -33,9 +39,14 @@ def log_action(action: str, verbose: bool = False) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Подготавливаем данные для логирования
+            # При выключенном INFO декоратор — прозрачный проброс:
+            # ни интроспекции аргументов, ни сборки контекста
+            if not _action_logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwargs)
+
+            # Подготавливаем данные для логирования; отметку времени
+            # добавляет сам логгер через %(asctime)s
             log_data: dict[str, Any] = {
-                "timestamp": datetime.now().isoformat(),
                 "action": action,
             }
 
@@ -45,38 +56,38 @@ def log_action(action: str, verbose: bool = False) -> Callable:
             try:
                 # Пытаемся извлечь username/user_id из глобального состояния
                 # или из аргументов
-                from valutatrade_hub.core.usecases import get_current_user
+                global _get_current_user
+                if _get_current_user is None:
+                    from valutatrade_hub.core.usecases import get_current_user
+
+                    _get_current_user = get_current_user
 
-                current_user = get_current_user()
+                current_user = _get_current_user()
                 if current_user:
                     log_data["username"] = current_user.username
                     log_data["user_id"] = current_user.user_id
-                else:
-                    # Если пользователь не залогинен, пытаемся получить из args
-                    if args and len(args) > 0:
-                        # Для register_user и login_user первый аргумент - username
-                        if action in ("REGISTER", "LOGIN"):
-                            log_data["username"] = args[0] if args else "unknown"
+                elif args and action in ("REGISTER", "LOGIN"):
+                    # Если пользователь не залогинен, первый позиционный
+                    # аргумент register_user/login_user — username
+                    log_data["username"] = args[0]
             except Exception:
                 pass
 
-            # Извлекаем параметры операции
+            # Извлекаем параметры операции (kwargs с откатом на args)
             if action in ("BUY", "SELL"):
-                # Ищем currency, amount, base_currency в kwargs или args
-                if "currency" in kwargs:
-                    log_data["currency_code"] = kwargs["currency"]
-                elif len(args) > 0:
-                    log_data["currency_code"] = args[0]
-
-                if "amount" in kwargs:
-                    log_data["amount"] = kwargs["amount"]
-                elif len(args) > 1:
-                    log_data["amount"] = args[1]
-
-                if "base_currency" in kwargs:
-                    log_data["base"] = kwargs["base_currency"]
-                elif len(args) > 2:
-                    log_data["base"] = args[2]
+                n = len(args)
+
+                currency = kwargs.get("currency", args[0] if n > 0 else None)
+                if currency is not None:
+                    log_data["currency_code"] = currency
+
+                amount = kwargs.get("amount", args[1] if n > 1 else None)
+                if amount is not None:
+                    log_data["amount"] = amount
+
+                base = kwargs.get("base_currency", args[2] if n > 2 else None)
+                if base is not None:
+                    log_data["base"] = base
 
             # Выполняем функцию и логируем результат
             result = "OK"
@@ -113,59 +124,56 @@ def log_action(action: str, verbose: bool = False) -> Callable:
                 raise
 
             finally:
-                # Формируем строку лога
-                log_parts = [
-                    log_data["action"],
-                    f"user='{log_data.get('username', 'unknown')}'",
-                ]
-
-                if "currency_code" in log_data:
-                    currency = log_data["currency_code"]
-                    amount = log_data.get("amount", 0)
-                    # Форматируем amount в зависимости от валюты
-                    if currency in ("BTC", "ETH"):
-                        amount_str = f"{amount:.4f}"
-                    else:
-                        amount_str = f"{amount:.2f}"
-                    log_parts.append(f"currency='{currency}' amount={amount_str}")
-
-                if "rate" in log_data:
-                    rate = log_data["rate"]
-                    log_parts.append(f"rate={rate:.2f}")
-
-                if "base" in log_data:
-                    log_parts.append(f"base='{log_data['base']}'")
-
-                if verbose and "old_balance" in log_data:
-                    old_bal = log_data["old_balance"]
-                    new_bal = log_data["new_balance"]
-                    currency = log_data.get("currency_code", "")
-                    if currency in ("BTC", "ETH"):
-                        old_str = f"{old_bal:.4f}"
-                        new_str = f"{new_bal:.4f}"
-                    else:
-                        old_str = f"{old_bal:.2f}"
-                        new_str = f"{new_bal:.2f}"
-                    log_parts.append(
-                        f"balance={old_str}→{new_str} {currency}"
-                    )
-
-                log_parts.append(f"result={log_data['result']}")
-
-                if error_type:
-                    log_parts.append(f"error_type='{error_type}'")
-                if error_message:
-                    # Ограничиваем длину сообщения об ошибке
-                    error_msg_short = (
-                        error_message[:100] + "..."
-                        if len(error_message) > 100
-                        else error_message
-                    )
-                    log_parts.append(f"error_message='{error_msg_short}'")
-
-                # Логируем на уровне INFO
-                log_message = " ".join(log_parts)
-                _action_logger.info(log_message)
+                # Сборка строки нужна, только если лог реально пишется
+                if _action_logger.isEnabledFor(logging.INFO):
+                    # Формируем строку лога
+                    log_parts = [
+                        log_data["action"],
+                        f"user='{log_data.get('username', 'unknown')}'",
+                    ]
+
+                    if "currency_code" in log_data:
+                        currency = log_data["currency_code"]
+                        amount = log_data.get("amount", 0)
+                        # Точность зависит от валюты
+                        amount_str = fmt_amount(amount, currency)
+                        log_parts.append(
+                            f"currency='{currency}' amount={amount_str}"
+                        )
+
+                    if "rate" in log_data:
+                        rate = log_data["rate"]
+                        log_parts.append(f"rate={rate:.2f}")
+
+                    if "base" in log_data:
+                        log_parts.append(f"base='{log_data['base']}'")
+
+                    if verbose and "old_balance" in log_data:
+                        old_bal = log_data["old_balance"]
+                        new_bal = log_data["new_balance"]
+                        currency = log_data.get("currency_code", "")
+                        old_str = fmt_amount(old_bal, currency)
+                        new_str = fmt_amount(new_bal, currency)
+                        log_parts.append(
+                            f"balance={old_str}→{new_str} {currency}"
+                        )
+
+                    log_parts.append(f"result={log_data['result']}")
+
+                    if error_type:
+                        log_parts.append(f"error_type='{error_type}'")
+                    if error_message:
+                        # Ограничиваем длину сообщения об ошибке
+                        error_msg_short = (
+                            error_message[:100] + "..."
+                            if len(error_message) > 100
+                            else error_message
+                        )
+                        log_parts.append(f"error_message='{error_msg_short}'")
+
+                    # Логируем на уровне INFO
+                    log_message = " ".join(log_parts)
+                    _action_logger.info(log_message)
 
         return wrapper
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -19,8 +20,13 @@ class DatabaseManager:
     Реализация через __new__ выбрана для простоты и читабельности.
     """
 
+    # Без __dict__ экземпляр компактнее, а доступ к _data_dir быстрее;
+    # слот несовместим с одноимённым атрибутом класса, поэтому
+    # плейсхолдера _data_dir = None на уровне класса больше нет
+    __slots__ = ("_data_dir",)
+
     _instance: DatabaseManager | None = None
-    _data_dir: Path | None = None
+    _lock = threading.Lock()
 
     def __new__(cls) -> DatabaseManager:
         """
@@ -29,9 +35,16 @@ class DatabaseManager:
         Returns:
             Единственный экземпляр DatabaseManager
         """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
+        # Быстрый путь без блокировки; под блокировкой экземпляр
+        # публикуется только после завершения _initialize, чтобы
+        # другие потоки не увидели недоинициализированный объект
+        if cls._instance is not None:
+            return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._initialize()
+                cls._instance = instance
         return cls._instance
 
     def _initialize(self) -> None:
@@ -85,8 +98,11 @@ class DatabaseManager:
         file_path = self._data_dir / filename
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Сериализация одним вызовом и одна запись вместо множества
+        # мелких write() из json.dump
+        payload = json.dumps(data, indent=2, ensure_ascii=False)
         with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write(payload)
 
     def get_data_dir(self) -> Path:
         """
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -15,8 +16,12 @@ except ImportError:
 class SettingsLoader:
     """Загрузчик конфигурации (Singleton)."""
 
+    # Без __dict__ экземпляр компактнее, а доступ к _config быстрее;
+    # _instance и _lock остаются атрибутами класса
+    __slots__ = ("_config",)
+
     _instance: SettingsLoader | None = None
-    _config: dict[str, Any] = {}
+    _lock = threading.Lock()
 
     def __new__(cls) -> SettingsLoader:
         """
@@ -25,13 +30,23 @@ class SettingsLoader:
         Returns:
             Единственный экземпляр SettingsLoader
         """
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._load_config()
+        # Быстрый путь без блокировки; под блокировкой экземпляр
+        # публикуется только после завершения _load_config, чтобы
+        # другие потоки не увидели недоинициализированный объект
+        if cls._instance is not None:
+            return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance._load_config()
+                cls._instance = instance
         return cls._instance
 
     def _load_config(self) -> None:
         """Загрузить конфигурацию из pyproject.toml или config.json."""
+        # Конфигурация живёт в атрибуте экземпляра: словарь на уровне
+        # класса разделялся бы всеми экземплярами и пережил бы reload
+        self._config: dict[str, Any] = {}
         project_root = Path(__file__).parent.parent.parent
 
         pyproject_path = project_root / "pyproject.toml"
@@ -85,6 +100,5 @@ class SettingsLoader:
 
     def reload(self) -> None:
         """Перезагрузить конфигурацию из файлов."""
-        self._config.clear()
         self._load_config()
 
@@ -1,26 +1,52 @@
 """Конфигурация логирования для приложения."""
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 from valutatrade_hub.infra.settings import SettingsLoader
 
 _settings = SettingsLoader()
 
+# Явная таблица уровней вместо getattr по модулю logging
+_LEVELS = {
+    name: getattr(logging, name)
+    for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+}
+
+# Фоновый слушатель очереди логов (запускается в setup_logging)
+_listener: QueueListener | None = None
+
+
+def _stop_listener() -> None:
+    """Остановить фоновый слушатель логов, если он запущен."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Гарантируем дозапись накопленных записей при завершении процесса
+atexit.register(_stop_listener)
+
 
 def setup_logging() -> None:
     """
     Настроить логирование для приложения.
 
     Создаёт логгер с ротацией файлов и настраивает формат.
+    Записи проходят через очередь: горячий путь только кладёт запись,
+    а файловый и консольный вывод выполняет фоновый поток.
     """
+    global _listener
     log_file = _settings.get("log_file", "logs/app.log")
     log_level_str = _settings.get("log_level", "INFO").upper()
 
     # Преобразуем строку уровня в константу logging
-    log_level = getattr(logging, log_level_str, logging.INFO)
+    log_level = _LEVELS.get(log_level_str, logging.INFO)
 
     # Создаём директорию для логов, если её нет
     log_path = Path(log_file)
@@ -32,6 +58,7 @@ def setup_logging() -> None:
 
     # Удаляем существующие обработчики, чтобы избежать дублирования
     root_logger.handlers.clear()
+    _stop_listener()
 
     # Формат логов (человекочитаемый)
     formatter = logging.Formatter(
@@ -49,14 +76,25 @@ def setup_logging() -> None:
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
 
     # Обработчик для консоли (опционально, для отладки)
     # В production можно отключить
     console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setLevel(logging.WARNING)  # Только WARNING и выше в консоль
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+
+    # Логгеры кладут записи в очередь, реальную запись в файл и на
+    # консоль выполняет фоновый поток QueueListener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -21,6 +21,14 @@ class BaseApiClient(ABC):
             config: Конфигурация парсера
         """
         self.config = config
+        # Одна сессия на клиент: keep-alive переиспользует TCP/TLS
+        # соединение между повторными обновлениями вместо нового
+        # рукопожатия на каждый запрос
+        self._session = requests.Session()
+
+    def close(self) -> None:
+        """Закрыть HTTP-сессию и освободить соединения."""
+        self._session.close()
 
     @abstractmethod
     def fetch_rates(self) -> dict[str, float]:
@@ -40,6 +48,23 @@ class BaseApiClient(ABC):
 class CoinGeckoClient(BaseApiClient):
     """Клиент для работы с CoinGecko API."""
 
+    def __init__(self, config: ParserConfig) -> None:
+        """
+        Инициализация клиента CoinGecko.
+
+        Args:
+            config: Конфигурация парсера
+        """
+        super().__init__(config)
+        # Соответствие ID CoinGecko -> ключ пары считается один раз:
+        # список валют и базовая валюта после создания не меняются
+        self._pair_plan: list[tuple[str, str]] = []
+        for crypto_code in config.CRYPTO_CURRENCIES:
+            crypto_id = config.CRYPTO_ID_MAP.get(crypto_code)
+            if crypto_id:
+                pair_key = f"{crypto_code}_{config.BASE_CURRENCY}"
+                self._pair_plan.append((crypto_id, pair_key))
+
     def fetch_rates(self) -> dict[str, float]:
         """
         Получить курсы криптовалют от CoinGecko.
@@ -53,7 +78,9 @@ class CoinGeckoClient(BaseApiClient):
         url = self.config.get_coingecko_url()
 
         try:
-            response = requests.get(url, timeout=self.config.REQUEST_TIMEOUT)
+            response = self._session.get(
+                url, timeout=self.config.REQUEST_TIMEOUT
+            )
 
             # Проверяем статус ответа
             if response.status_code != 200:
@@ -66,16 +93,11 @@ class CoinGeckoClient(BaseApiClient):
 
             # Преобразуем ответ CoinGecko в стандартизированный формат
             rates: dict[str, float] = {}
-            base_currency = self.config.BASE_CURRENCY
 
-            for crypto_code in self.config.CRYPTO_CURRENCIES:
-                crypto_id = self.config.CRYPTO_ID_MAP.get(crypto_code)
-                if crypto_id and crypto_id in data:
-                    crypto_data = data[crypto_id]
-                    if "usd" in crypto_data:
-                        rate = float(crypto_data["usd"])
-                        pair_key = f"{crypto_code}_{base_currency}"
-                        rates[pair_key] = rate
+            for crypto_id, pair_key in self._pair_plan:
+                crypto_data = data.get(crypto_id)
+                if crypto_data is not None and "usd" in crypto_data:
+                    rates[pair_key] = float(crypto_data["usd"])
 
             return rates
 
@@ -92,6 +114,21 @@ class CoinGeckoClient(BaseApiClient):
 class ExchangeRateApiClient(BaseApiClient):
     """Клиент для работы с ExchangeRate-API."""
 
+    def __init__(self, config: ParserConfig) -> None:
+        """
+        Инициализация клиента ExchangeRate-API.
+
+        Args:
+            config: Конфигурация парсера
+        """
+        super().__init__(config)
+        # Ключи пар для штатного случая (база из ответа совпадает с
+        # настроенной) собираются один раз, а не на каждый запрос
+        self._pair_keys: dict[str, str] = {
+            fiat_code: f"{fiat_code}_{config.BASE_CURRENCY}"
+            for fiat_code in config.FIAT_CURRENCIES
+        }
+
     def fetch_rates(self) -> dict[str, float]:
         """
         Получить курсы фиатных валют от ExchangeRate-API.
@@ -111,7 +148,9 @@ class ExchangeRateApiClient(BaseApiClient):
         url = self.config.get_exchangerate_url()
 
         try:
-            response = requests.get(url, timeout=self.config.REQUEST_TIMEOUT)
+            response = self._session.get(
+                url, timeout=self.config.REQUEST_TIMEOUT
+            )
 
             # Проверяем статус ответа
             if response.status_code == 429:
@@ -139,11 +178,15 @@ class ExchangeRateApiClient(BaseApiClient):
             rates: dict[str, float] = {}
             base_currency = data.get("base_code", self.config.BASE_CURRENCY)
             rates_data = data.get("rates", {})
+            use_precomputed = base_currency == self.config.BASE_CURRENCY
 
             for fiat_code in self.config.FIAT_CURRENCIES:
                 if fiat_code in rates_data:
                     rate = float(rates_data[fiat_code])
-                    pair_key = f"{fiat_code}_{base_currency}"
+                    if use_precomputed:
+                        pair_key = self._pair_keys[fiat_code]
+                    else:
+                        pair_key = f"{fiat_code}_{base_currency}"
                     rates[pair_key] = rate
 
             return rates
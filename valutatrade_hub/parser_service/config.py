@@ -1,11 +1,13 @@
 """Конфигурация API и параметров обновления."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass
+# slots=True убирает __dict__ экземпляра: конфигурация компактнее,
+# а чтение её атрибутов в горячих путях парсера быстрее
+@dataclass(slots=True)
 class ParserConfig:
     """Конфигурация для Parser Service."""
 
@@ -22,7 +24,13 @@ class ParserConfig:
     CRYPTO_CURRENCIES: tuple = ("BTC", "ETH", "SOL")
 
     # Словарь соответствий кодов криптовалют и их ID в CoinGecko
-    CRYPTO_ID_MAP: dict = None
+    CRYPTO_ID_MAP: dict = field(
+        default_factory=lambda: {
+            "BTC": "bitcoin",
+            "ETH": "ethereum",
+            "SOL": "solana",
+        }
+    )
 
     # Пути к файлам (относительно корня проекта)
     RATES_FILE_PATH: str = "data/rates.json"
@@ -31,14 +39,29 @@ class ParserConfig:
     # Сетевые параметры
     REQUEST_TIMEOUT: int = 10
 
+    # Порог ротации файла истории курсов (в байтах)
+    HISTORY_ROTATE_BYTES: int = 10 * 1024 * 1024
+
+    # Собранные URL; заполняются в __post_init__
+    _exchangerate_url: str = field(init=False, repr=False)
+    _coingecko_url: str = field(init=False, repr=False)
+
     def __post_init__(self) -> None:
-        """Инициализация значений по умолчанию."""
-        if self.CRYPTO_ID_MAP is None:
-            self.CRYPTO_ID_MAP = {
-                "BTC": "bitcoin",
-                "ETH": "ethereum",
-                "SOL": "solana",
-            }
+        """Инициализация производных значений."""
+        # Конфигурация после создания не меняется, поэтому полные URL
+        # собираются один раз, а не на каждый запрос
+        self._exchangerate_url = (
+            f"{self.EXCHANGERATE_API_URL}/{self.EXCHANGERATE_API_KEY}/"
+            f"latest/{self.BASE_CURRENCY}"
+        )
+        crypto_ids = [
+            self.CRYPTO_ID_MAP.get(code, code.lower())
+            for code in self.CRYPTO_CURRENCIES
+        ]
+        ids_param = ",".join(crypto_ids)
+        self._coingecko_url = (
+            f"{self.COINGECKO_URL}?ids={ids_param}&vs_currencies=usd"
+        )
 
     def get_exchangerate_url(self) -> str:
         """
@@ -47,10 +70,7 @@ class ParserConfig:
         Returns:
             Полный URL с API-ключом и базовой валютой
         """
-        return (
-            f"{self.EXCHANGERATE_API_URL}/{self.EXCHANGERATE_API_KEY}/"
-            f"latest/{self.BASE_CURRENCY}"
-        )
+        return self._exchangerate_url
 
     def get_coingecko_url(self) -> str:
         """
@@ -59,13 +79,7 @@ class ParserConfig:
         Returns:
             Полный URL с параметрами запроса
         """
-        # Формируем список ID криптовалют
-        crypto_ids = [
-            self.CRYPTO_ID_MAP.get(code, code.lower())
-            for code in self.CRYPTO_CURRENCIES
-        ]
-        ids_param = ",".join(crypto_ids)
-        return f"{self.COINGECKO_URL}?ids={ids_param}&vs_currencies=usd"
+        return self._coingecko_url
 
     def get_rates_file_path(self) -> Path:
         """
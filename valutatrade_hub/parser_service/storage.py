@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import json
+import os
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 
 from valutatrade_hub.parser_service.config import ParserConfig
@@ -22,6 +25,13 @@ class RatesStorage:
         self.config = config
         self.rates_file = config.get_rates_file_path()
         self.history_file = config.get_history_file_path()
+        # История ведётся в append-only NDJSON: одна запись — одна
+        # строка, добавление не перечитывает и не переписывает файл
+        self.history_ndjson = self.history_file.with_suffix(".ndjson")
+        # Кэш rates.json в памяти: файл перечитывается только если
+        # его mtime изменился (например, записал другой процесс)
+        self._rates_cache: dict[str, Any] | None = None
+        self._rates_cache_mtime_ns = 0
 
     def save_rate_to_history(
         self,
@@ -44,37 +54,55 @@ class RatesStorage:
         Returns:
             ID созданной записи
         """
-        timestamp = datetime.now(timezone.utc)
+        return self.save_rates_to_history_batch(
+            [(from_currency, to_currency, rate, source, meta)]
+        )[0]
+
+    def save_rates_to_history_batch(
+        self,
+        entries: list[tuple[str, str, float, str, dict[str, Any] | None]],
+        timestamp: datetime | None = None,
+    ) -> list[str]:
+        """
+        Сохранить пакет курсов в историю одной операцией записи.
+
+        Все записи пакета получают общую метку времени; файл истории
+        открывается один раз на весь пакет.
+
+        Args:
+            entries: Кортежи (from_currency, to_currency, rate,
+                     source, meta)
+            timestamp: Общая метка времени пакета
+                       (если None, берётся текущее время UTC)
+
+        Returns:
+            Список ID созданных записей (в порядке entries)
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
         timestamp_id = timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
-        record_id = f"{from_currency}_{to_currency}_{timestamp_id}"
-
-        record = {
-            "id": record_id,
-            "from_currency": from_currency.upper(),
-            "to_currency": to_currency.upper(),
-            "rate": float(rate),
-            "timestamp": timestamp.isoformat(),
-            "source": source,
-            "meta": meta or {},
-        }
-
-        history_data = self._load_history()
-
-        if history_data is None:
-            history_data = {
-                "source": "ParserService",
-                "last_update": None,
-                "records": [],
+        timestamp_iso = timestamp.isoformat()
+
+        record_ids: list[str] = []
+        lines: list[str] = []
+        for from_currency, to_currency, rate, source, meta in entries:
+            record_id = f"{from_currency}_{to_currency}_{timestamp_id}"
+            record = {
+                "id": record_id,
+                "from_currency": from_currency.upper(),
+                "to_currency": to_currency.upper(),
+                "rate": float(rate),
+                "timestamp": timestamp_iso,
+                "source": source,
+                "meta": meta or {},
             }
+            record_ids.append(record_id)
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
 
-        if "records" not in history_data:
-            history_data["records"] = []
-        history_data["records"].append(record)
-        history_data["last_update"] = timestamp.isoformat()
+        if lines:
+            self._append_history_lines(lines)
 
-        self._save_history_atomic(history_data)
-
-        return record_id
+        return record_ids
 
     def update_rates_cache(
         self, rates: dict[str, float], sources: dict[str, str]
@@ -97,19 +125,13 @@ class RatesStorage:
             existing = cache_data["pairs"].get(pair_key, {})
             existing_timestamp = existing.get("updated_at")
 
+            # Метки пишутся isoformat() в UTC с фиксированной шириной,
+            # поэтому лексикографическое сравнение строк эквивалентно
+            # сравнению дат и не требует разбора ISO на каждую пару
             should_update = True
-            if existing_timestamp:
-                try:
-                    existing_dt = datetime.fromisoformat(
-                        existing_timestamp.replace("Z", "+00:00")
-                    )
-                    new_dt = datetime.fromisoformat(
-                        timestamp.replace("Z", "+00:00")
-                    )
-                    if existing_dt >= new_dt:
-                        should_update = False
-                except (ValueError, TypeError):
-                    pass
+            if isinstance(existing_timestamp, str):
+                if existing_timestamp >= timestamp:
+                    should_update = False
 
             if should_update:
                 cache_data["pairs"][pair_key] = {
@@ -122,54 +144,85 @@ class RatesStorage:
 
         self._save_rates_cache_atomic(cache_data)
 
-    def _load_history(self) -> dict[str, Any]:
+    def _append_history_lines(self, lines: list[str]) -> None:
         """
-        Загрузить историю из exchange_rates.json.
+        Дописать готовые NDJSON-строки в конец файла истории.
 
-        Returns:
-            Данные истории
+        Args:
+            lines: Строки с завершающим переводом строки
         """
-        if not self.history_file.exists():
-            return {
-                "source": "ParserService",
-                "last_update": None,
-                "records": [],
-            }
+        self.history_ndjson.parent.mkdir(parents=True, exist_ok=True)
+        self._rotate_history_if_needed()
 
-        try:
-            with open(self.history_file, encoding="utf-8") as f:
-                data = json.load(f)
-                if "records" not in data:
-                    data["records"] = []
-                return data
-        except (json.JSONDecodeError, OSError):
-            return {
-                "source": "ParserService",
-                "last_update": None,
-                "records": [],
-            }
+        with open(self.history_ndjson, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            # Один fsync на весь пакет: записи гарантированно на диске
+            f.flush()
+            os.fsync(f.fileno())
 
-    def _save_history_atomic(self, data: dict[str, Any]) -> None:
+    def _rotate_history_if_needed(self) -> None:
         """
-        Сохранить историю атомарно (через временный файл).
+        Отвести разросшийся файл истории в датированный архив.
 
-        Args:
-            data: Данные для сохранения
+        Если текущий NDJSON-файл превысил HISTORY_ROTATE_BYTES, он
+        переименовывается в exchange_rates.<дата>.ndjson, и записи
+        продолжаются в новый файл. Добавление остаётся O(1): старые
+        записи никогда не перечитываются и не переписываются.
         """
-        temp_file = self.history_file.with_suffix(".tmp")
-
-        # Создаём директорию, если её нет
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
-
         try:
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            size = os.stat(self.history_ndjson).st_size
+        except OSError:
+            return
+
+        if size < self.config.HISTORY_ROTATE_BYTES:
+            return
+
+        # Микросекунды в имени исключают коллизию (и потерю архива),
+        # если две ротации случились в одну секунду
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        archive = self.history_ndjson.with_name(
+            f"{self.history_ndjson.stem}.{stamp}{self.history_ndjson.suffix}"
+        )
+        os.replace(self.history_ndjson, archive)
+
+    def iter_history(self) -> Iterator[dict[str, Any]]:
+        """
+        Перебрать записи истории без загрузки всего файла в память.
 
-            temp_file.replace(self.history_file)
-        except Exception:
-            if temp_file.exists():
-                temp_file.unlink()
-            raise
+        Сначала отдаются записи из устаревшего exchange_rates.json
+        (если он остался от старых версий), затем построчно — записи
+        отведённых при ротации архивов и текущего NDJSON-файла.
+        Повреждённые строки пропускаются.
+
+        Yields:
+            Записи истории в порядке добавления
+        """
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, encoding="utf-8") as f:
+                    data = json.load(f)
+                yield from data.get("records", [])
+            except (json.JSONDecodeError, OSError):
+                pass
+
+        # Архивы именуются датой ротации, поэтому сортировка по имени
+        # даёт хронологический порядок; текущий файл — последним
+        archives = sorted(
+            self.history_ndjson.parent.glob(
+                f"{self.history_ndjson.stem}.*{self.history_ndjson.suffix}"
+            )
+        )
+        for path in [*archives, self.history_ndjson]:
+            if not path.exists():
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
 
     def _load_rates_cache(self) -> dict[str, Any]:
         """
@@ -178,24 +231,32 @@ class RatesStorage:
         Returns:
             Данные кэша
         """
-        if not self.rates_file.exists():
+        try:
+            mtime_ns = os.stat(self.rates_file).st_mtime_ns
+        except OSError:
             return {
                 "pairs": {},
                 "last_refresh": None,
             }
 
+        if self._rates_cache is not None and self._rates_cache_mtime_ns == mtime_ns:
+            return self._rates_cache
+
         try:
             with open(self.rates_file, encoding="utf-8") as f:
                 data = json.load(f)
-                if "pairs" not in data:
-                    data["pairs"] = {}
-                return data
+            if "pairs" not in data:
+                data["pairs"] = {}
         except (json.JSONDecodeError, OSError):
             return {
                 "pairs": {},
                 "last_refresh": None,
             }
 
+        self._rates_cache = data
+        self._rates_cache_mtime_ns = mtime_ns
+        return data
+
     def _save_rates_cache_atomic(self, data: dict[str, Any]) -> None:
         """
         Сохранить кэш курсов атомарно (через временный файл).
@@ -208,12 +269,43 @@ class RatesStorage:
         # Создаём директорию, если её нет
         self.rates_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Сериализация одним вызовом и одна запись вместо множества
+        # мелких write() из json.dump
+        payload = json.dumps(data, indent=2, ensure_ascii=False)
+
         try:
             with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(payload)
+                # fsync до замены: после rename на диске либо старая,
+                # либо полная новая версия файла
+                f.flush()
+                os.fsync(f.fileno())
 
             temp_file.replace(self.rates_file)
+            self._fsync_dir(self.rates_file.parent)
+            # Сквозная запись в кэш: следующий _load_rates_cache
+            # вернёт эти данные без чтения файла
+            self._rates_cache = data
+            self._rates_cache_mtime_ns = os.stat(self.rates_file).st_mtime_ns
         except Exception:
             if temp_file.exists():
                 temp_file.unlink()
             raise
+
+    @staticmethod
+    def _fsync_dir(directory: Path) -> None:
+        """
+        Сбросить метаданные каталога на диск (закрепляет rename).
+
+        Args:
+            directory: Каталог, содержащий заменённый файл
+        """
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            # Windows не позволяет открыть каталог — пропускаем
+            return
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
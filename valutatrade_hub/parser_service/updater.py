@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Any
 
@@ -67,59 +68,89 @@ class RatesUpdater:
         """
         _logger.info("Начало обновления курсов валют")
 
+        # Одна метка времени на весь прогон: все записи истории,
+        # метаданные и итог ссылаются на один момент обновления
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+
         all_rates: dict[str, float] = {}
         all_sources: dict[str, str] = {}
         errors: list[str] = []
-
+        # Записи истории копятся и пишутся одним пакетом после опроса
+        # всех клиентов — одна операция записи на весь прогон
+        pending_history: list[tuple] = []
+
+        # Клиенты опрашиваются параллельно: запросы независимы и
+        # ограничены сетью, поэтому прогон длится max, а не сумму
+        # времён ответов источников. Без клиентов пул не создаётся
+        # (max_workers=0 недопустим) — сработает общая ошибка ниже
+        results: dict[BaseApiClient, dict[str, float] | Exception] = {}
+        if self.clients:
+            with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+                futures = {}
+                for client in self.clients:
+                    _logger.info(
+                        f"Запрос курсов от {client.__class__.__name__}"
+                    )
+                    futures[executor.submit(client.fetch_rates)] = client
+                for future in as_completed(futures):
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        results[futures[future]] = e
+
+        # Результаты сливаются в исходном порядке клиентов, чтобы
+        # приоритет источников не зависел от порядка завершения
         for client in self.clients:
             client_name = client.__class__.__name__
-            _logger.info(f"Запрос курсов от {client_name}")
-
-            try:
-                rates = client.fetch_rates()
-                _logger.info(
-                    f"{client_name}: получено {len(rates)} курсов"
-                )
+            outcome = results[client]
 
-                if isinstance(client, CoinGeckoClient):
-                    source = "CoinGecko"
-                elif isinstance(client, ExchangeRateApiClient):
-                    source = "ExchangeRate-API"
-                else:
-                    source = client_name
-
-                for pair_key, rate in rates.items():
-                    all_rates[pair_key] = rate
-                    all_sources[pair_key] = source
-
-                    from_currency, to_currency = pair_key.split("_", 1)
-                    self.storage.save_rate_to_history(
-                        from_currency=from_currency,
-                        to_currency=to_currency,
-                        rate=rate,
-                        source=source,
-                        meta={
-                            "client": client_name,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        },
-                    )
-
-            except ApiRequestError as e:
-                error_msg = f"{client_name}: {e}"
+            if isinstance(outcome, ApiRequestError):
+                error_msg = f"{client_name}: {outcome}"
                 _logger.error(error_msg)
                 errors.append(error_msg)
                 continue
-            except Exception as e:
-                error_msg = f"{client_name}: Неожиданная ошибка - {e}"
-                _logger.exception(error_msg)
+            if isinstance(outcome, Exception):
+                error_msg = f"{client_name}: Неожиданная ошибка - {outcome}"
+                _logger.error(error_msg, exc_info=outcome)
                 errors.append(error_msg)
                 continue
 
+            rates = outcome
+            _logger.info(f"{client_name}: получено {len(rates)} курсов")
+
+            if isinstance(client, CoinGeckoClient):
+                source = "CoinGecko"
+            elif isinstance(client, ExchangeRateApiClient):
+                source = "ExchangeRate-API"
+            else:
+                source = client_name
+
+            for pair_key, rate in rates.items():
+                all_rates[pair_key] = rate
+                all_sources[pair_key] = source
+
+                from_currency, to_currency = pair_key.split("_", 1)
+                pending_history.append(
+                    (
+                        from_currency,
+                        to_currency,
+                        rate,
+                        source,
+                        {
+                            "client": client_name,
+                            "timestamp": now_iso,
+                        },
+                    )
+                )
+
         if not all_rates:
             error_msg = "Не удалось получить курсы ни от одного источника"
             _logger.error(error_msg)
             raise ApiRequestError(error_msg)
 
+        self.storage.save_rates_to_history_batch(pending_history, timestamp=now)
+
         _logger.info(f"Обновление кэша: {len(all_rates)} пар валют")
         self.storage.update_rates_cache(all_rates, all_sources)
 
@@ -128,7 +159,7 @@ class RatesUpdater:
             "total_pairs": len(all_rates),
             "sources": all_sources,
             "errors": errors,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now_iso,
         }
 
         _logger.info(